@@ -6,121 +6,268 @@ Tracks scraping progress and creates checkpoints for resume capability.
 Updates statistics after each job is saved.
 """
 import json
+import mmap
 import sys
 import os
+import time
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
 
 CHECKPOINT_FILE = "output/checkpoints/checkpoint_latest.json"
+CHECKPOINT_LOG = "output/checkpoints/checkpoint_latest.log"
 CHECKPOINT_DIR = "output/checkpoints"
+SNAPSHOT_INTERVAL = 50  # Jobs between full checkpoint snapshots
+MMAP_THRESHOLD = 64 * 1024  # Job files at least this large are memory-mapped
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes, indented unless compact output is requested."""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _read_json_file(file_path):
+    """Parse a JSON file, memory-mapping it instead of copying when it is large."""
+    with open(file_path, 'rb') as f:
+        # Only orjson can parse straight from the mapped buffer
+        if orjson is None or os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return _loads(f.read())
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def _write_atomic(path, data: bytes):
+    """Write bytes via a temp file and rename, so readers never see a torn file."""
+    path = Path(path)
+    tmp = tempfile.NamedTemporaryFile(mode='wb', delete=False, dir=str(path.parent),
+                                      prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
 
 
-def load_checkpoint():
-    """Load existing checkpoint or create new one."""
+def load_checkpoint(now=None):
+    """
+    Load existing checkpoint (snapshot plus journal) or create new one.
+
+    Args:
+        now: Current datetime, shared across the hook invocation
+    """
     checkpoint_path = Path(CHECKPOINT_FILE)
+    checkpoint = None
 
     if checkpoint_path.exists():
         try:
-            with open(checkpoint_path, 'r') as f:
-                return json.load(f)
+            with open(checkpoint_path, 'rb') as f:
+                checkpoint = _loads(f.read())
         except (json.JSONDecodeError, IOError):
             # Corrupted checkpoint, create new
             pass
 
-    # Create new checkpoint
-    return {
-        "session_id": f"scrape_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-        "start_time": datetime.now().isoformat(),
-        "stats": {
-            "urls_discovered": 0,
-            "urls_processed": 0,
-            "urls_pending": 0,
-            "jobs_extracted": 0,
-            "jobs_incomplete": 0,
-            "jobs_failed": 0,
-            "total_processing_time": 0.0
-        },
-        "quality_metrics": {
-            "total_confidence": 0,
-            "total_completeness": 0,
-            "jobs_graded": 0
-        },
-        "current_url": None,
-        "last_update": datetime.now().isoformat()
-    }
+    if checkpoint is None:
+        now = now or datetime.now()
+        checkpoint = {
+            "session_id": f"scrape_{now.strftime('%Y%m%d_%H%M%S')}",
+            "start_time": now.isoformat(),
+            "start_time_epoch": now.timestamp(),
+            "stats": {
+                "urls_discovered": 0,
+                "urls_processed": 0,
+                "urls_pending": 0,
+                "jobs_extracted": 0,
+                "jobs_incomplete": 0,
+                "jobs_failed": 0,
+                "total_processing_time": 0.0
+            },
+            "quality_metrics": {
+                "total_confidence": 0,
+                "total_completeness": 0,
+                "jobs_graded": 0,
+                "avg_confidence": 0.0,
+                "avg_completeness": 0.0
+            },
+            "current_url": None,
+            "last_update": now.isoformat()
+        }
+    else:
+        # Backfill fields missing from checkpoints written by older versions
+        if "start_time_epoch" not in checkpoint:
+            checkpoint["start_time_epoch"] = datetime.fromisoformat(checkpoint["start_time"]).timestamp()
 
+        quality = checkpoint["quality_metrics"]
+        if "avg_confidence" not in quality:
+            graded = quality["jobs_graded"]
+            quality["avg_confidence"] = quality["total_confidence"] / graded if graded else 0.0
+            quality["avg_completeness"] = quality["total_completeness"] / graded if graded else 0.0
 
-def save_checkpoint(checkpoint):
-    """Save checkpoint to file."""
+    replay_journal(checkpoint)
+    return checkpoint
+
+
+def replay_journal(checkpoint):
+    """
+    Apply journal deltas written since the last snapshot.
+
+    Only deltas that directly follow the snapshot's processed count are applied,
+    so entries already folded into the snapshot are skipped.
+
+    Args:
+        checkpoint: Checkpoint loaded from the snapshot
+    """
+    log_path = Path(CHECKPOINT_LOG)
+    if not log_path.exists():
+        return
+
+    try:
+        with open(log_path, 'rb') as f:
+            for line in f:
+                try:
+                    delta = _loads(line)
+                except json.JSONDecodeError:
+                    # Torn write at the end of the journal
+                    break
+
+                if delta.get("seq") == checkpoint["stats"]["urls_processed"] + 1:
+                    apply_delta(checkpoint, delta)
+    except IOError:
+        pass
+
+
+def save_checkpoint(checkpoint, delta=None, now_iso=None):
+    """
+    Persist checkpoint progress.
+
+    Appends the delta to the journal, and writes a full snapshot (truncating the
+    journal) every SNAPSHOT_INTERVAL jobs or when no snapshot exists yet.
+
+    Args:
+        checkpoint: Current checkpoint data
+        delta: Journal delta for the latest job, or None to force a snapshot
+        now_iso: Current time as ISO string, shared across the hook invocation
+    """
     checkpoint_path = Path(CHECKPOINT_FILE)
     checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
 
+    jobs_processed = checkpoint["stats"]["urls_processed"]
+    if delta is not None and jobs_processed % SNAPSHOT_INTERVAL != 0 and checkpoint_path.exists():
+        with open(CHECKPOINT_LOG, 'ab') as f:
+            f.write(_dumps(delta, indent=False) + b'\n')
+        return
+
     # Update timestamp
-    checkpoint["last_update"] = datetime.now().isoformat()
+    checkpoint["last_update"] = now_iso or datetime.now().isoformat()
 
-    # Write checkpoint
-    with open(checkpoint_path, 'w') as f:
-        json.dump(checkpoint, f, indent=2)
+    # Write snapshot, then drop the deltas it already contains
+    _write_atomic(checkpoint_path, _dumps(checkpoint))
+    open(CHECKPOINT_LOG, 'wb').close()
 
     # Also save timestamped backup every 50 jobs
-    jobs_processed = checkpoint["stats"]["urls_processed"]
-    if jobs_processed % 50 == 0 and jobs_processed > 0:
+    if jobs_processed % SNAPSHOT_INTERVAL == 0 and jobs_processed > 0:
         backup_file = f"{CHECKPOINT_DIR}/checkpoint_{checkpoint['session_id']}_{jobs_processed}.json"
         Path(backup_file).parent.mkdir(parents=True, exist_ok=True)
-        with open(backup_file, 'w') as f:
-            json.dump(checkpoint, f, indent=2)
+        _write_atomic(backup_file, _dumps(checkpoint))
 
 
-def update_with_job_data(checkpoint, job_data):
+def update_with_job_data(checkpoint, job_data, now_iso=None):
     """
     Update checkpoint with information from a newly saved job.
 
     Args:
         checkpoint: Current checkpoint data
         job_data: Parsed job JSON data
-    """
-    stats = checkpoint["stats"]
-    quality = checkpoint["quality_metrics"]
+        now_iso: Current time as ISO string, shared across the hook invocation
 
-    # Increment processed count
-    stats["urls_processed"] += 1
-
-    # Update URL from job metadata if available
+    Returns:
+        dict: Journal delta describing the update
+    """
     job = job_data.get('job', {})
-    if 'url' in job:
-        checkpoint["current_url"] = job['url']
 
     # Get extraction info
     extraction = job.get('extraction', {})
-    fields_found = extraction.get('fieldsFound', 0)
-    fields_requested = extraction.get('fieldsRequested', 1)
 
-    # Calculate completeness
-    if fields_requested > 0:
-        completeness = (fields_found / fields_requested) * 100
-    else:
-        completeness = 0
+    # Prefer the completeness already computed by the extractor
+    completeness = extraction.get('dataCompleteness')
+    if completeness is None:
+        fields_found = extraction.get('fieldsFound', 0)
+        fields_requested = extraction.get('fieldsRequested', 1)
+
+        if fields_requested > 0:
+            completeness = (fields_found / fields_requested) * 100
+        else:
+            completeness = 0
+
+    delta = {
+        "seq": checkpoint["stats"]["urls_processed"] + 1,
+        "ts": now_iso or datetime.now().isoformat(),
+        "url": job.get('url'),
+        # Job is complete at >= 60% completeness
+        "complete": 1 if completeness >= 60 else 0,
+        "confidence": extraction.get('averageConfidence', 0),
+        "completeness": completeness,
+        "processing_time": job.get('metadata', {}).get('processingTime', 0) or 0
+    }
+
+    apply_delta(checkpoint, delta)
+    return delta
+
+
+def apply_delta(checkpoint, delta):
+    """
+    Apply a single job delta to the checkpoint.
+
+    Args:
+        checkpoint: Current checkpoint data
+        delta: Journal delta produced by update_with_job_data
+    """
+    stats = checkpoint["stats"]
+    quality = checkpoint["quality_metrics"]
 
-    # Determine if job is complete (>= 60% completeness)
-    if completeness >= 60:
+    stats["urls_processed"] = delta["seq"]
+
+    if delta["url"]:
+        checkpoint["current_url"] = delta["url"]
+
+    if delta["complete"]:
         stats["jobs_extracted"] += 1
     else:
         stats["jobs_incomplete"] += 1
 
-    # Update quality metrics
-    avg_confidence = extraction.get('averageConfidence', 0)
-    if avg_confidence > 0:
-        quality["total_confidence"] += avg_confidence
-        quality["total_completeness"] += completeness
+    # Update quality metrics, keeping running averages for progress output
+    if delta["confidence"] > 0:
+        quality["total_confidence"] += delta["confidence"]
+        quality["total_completeness"] += delta["completeness"]
         quality["jobs_graded"] += 1
 
-    # Update processing time
-    processing_time = job.get('metadata', {}).get('processingTime', 0)
-    if processing_time:
-        stats["total_processing_time"] += processing_time
+        graded = quality["jobs_graded"]
+        quality["avg_confidence"] += (delta["confidence"] - quality["avg_confidence"]) / graded
+        quality["avg_completeness"] += (delta["completeness"] - quality["avg_completeness"]) / graded
 
-    return checkpoint
+    stats["total_processing_time"] += delta["processing_time"]
+    checkpoint["last_update"] = delta["ts"]
 
 
 def format_progress_update(checkpoint):
@@ -136,17 +283,8 @@ def format_progress_update(checkpoint):
     stats = checkpoint["stats"]
     quality = checkpoint["quality_metrics"]
 
-    # Calculate averages
-    if quality["jobs_graded"] > 0:
-        avg_confidence = quality["total_confidence"] / quality["jobs_graded"]
-        avg_completeness = quality["total_completeness"] / quality["jobs_graded"]
-    else:
-        avg_confidence = 0
-        avg_completeness = 0
-
     # Calculate processing speed
-    start_time = datetime.fromisoformat(checkpoint["start_time"])
-    elapsed_seconds = (datetime.now() - start_time).total_seconds()
+    elapsed_seconds = time.time() - checkpoint["start_time_epoch"]
     if elapsed_seconds > 0 and stats["urls_processed"] > 0:
         jobs_per_minute = (stats["urls_processed"] / elapsed_seconds) * 60
     else:
@@ -174,8 +312,8 @@ def format_progress_update(checkpoint):
 
     # Quality metrics
     if quality["jobs_graded"] > 0:
-        lines.append(f"  Quality: {avg_completeness:.0f}% complete | "
-                    f"{avg_confidence:.0f}% avg confidence")
+        lines.append(f"  Quality: {quality['avg_completeness']:.0f}% complete | "
+                    f"{quality['avg_confidence']:.0f}% avg confidence")
 
     # Speed
     if jobs_per_minute > 0:
@@ -199,11 +337,18 @@ def format_progress_update(checkpoint):
 if __name__ == "__main__":
     try:
         # Read hook input from stdin
-        input_data = json.load(sys.stdin)
-        file_path = input_data.get('tool_input', {}).get('file_path', '')
+        raw = sys.stdin.buffer.read()
+
+        # Most tool events never touch a job file; reject them before parsing
+        if b'output/jobs/' not in raw:
+            sys.exit(0)
+
+        input_data = _loads(raw)
+        tool_input = input_data.get('tool_input', {})
+        file_path = tool_input.get('file_path', '')
 
         # Only track job data files
-        if not file_path.startswith('output/jobs/') or not file_path.endswith('.json'):
+        if not (file_path.endswith('.json') and file_path.startswith('output/jobs/')):
             # Not a job file, skip tracking
             sys.exit(0)
 
@@ -211,19 +356,28 @@ if __name__ == "__main__":
         if file_path == 'output/jobs.json':
             sys.exit(0)
 
-        # Load checkpoint
-        checkpoint = load_checkpoint()
-
-        # Read job data
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                job_data = json.load(f)
+        # Single timestamp for the whole invocation
+        now = datetime.now()
+        now_iso = now.isoformat()
 
+        # Load checkpoint
+        checkpoint = load_checkpoint(now)
+
+        # Read job data (Write events carry the content; other tools need the file)
+        content = tool_input.get('content')
+        if content:
+            job_data = _loads(content)
+        elif os.path.exists(file_path):
+            job_data = _read_json_file(file_path)
+        else:
+            job_data = None
+
+        if job_data is not None:
             # Update checkpoint
-            checkpoint = update_with_job_data(checkpoint, job_data)
+            delta = update_with_job_data(checkpoint, job_data, now_iso)
 
             # Save checkpoint
-            save_checkpoint(checkpoint)
+            save_checkpoint(checkpoint, delta, now_iso)
 
             # Print progress update every 10 jobs
             jobs_processed = checkpoint["stats"]["urls_processed"]
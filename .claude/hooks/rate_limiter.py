@@ -6,40 +6,60 @@ Prevents overwhelming target websites by enforcing rate limits on web requests.
 Tracks request history and implements exponential backoff when limits are reached.
 """
 import json
+import re
 import sys
 import time
 import os
+from collections import deque
 from pathlib import Path
 
 
 # Configuration
-RATE_LIMIT_FILE = Path.home() / ".claude" / "scraper_rate_limit.json"
+# Line-based history: backoff_until on the first line, then one request epoch per line
+RATE_LIMIT_FILE = Path.home() / ".claude" / "scraper_rate_limit.log"
 MIN_DELAY_SECONDS = 2  # Minimum delay between requests
 MAX_REQUESTS_PER_MINUTE = 20  # Maximum requests in a 60-second window
 BACKOFF_MULTIPLIER = 2  # Multiplier for exponential backoff
+COMPACT_AFTER = 2 * MAX_REQUESTS_PER_MINUTE  # Rewrite the history once it holds this many entries
+
+# Common web request commands or URLs in a Bash command, matched in one pass
+WEB_COMMAND_PATTERN = re.compile(r'(?i)(?:\bcurl\b|\bwget\b|https?://)')
 
 
 def load_request_history():
     """Load request history from file."""
-    if RATE_LIMIT_FILE.exists():
+    try:
+        lines = RATE_LIMIT_FILE.read_text().splitlines()
+    except (FileNotFoundError, IOError):
+        return [], 0
+
+    try:
+        backoff_until = float(lines[0]) if lines else 0
+    except ValueError:
+        return [], 0
+
+    requests = []
+    for line in lines[1:]:
         try:
-            with open(RATE_LIMIT_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get('requests', []), data.get('backoff_until', 0)
-        except (json.JSONDecodeError, IOError):
-            return [], 0
-    return [], 0
+            requests.append(float(line))
+        except ValueError:
+            # Torn line from an interrupted append
+            continue
+
+    return requests, backoff_until
 
 
 def save_request_history(requests, backoff_until=0):
-    """Save request history to file."""
+    """Rewrite the whole history file."""
     RATE_LIMIT_FILE.parent.mkdir(parents=True, exist_ok=True)
     with open(RATE_LIMIT_FILE, 'w') as f:
-        json.dump({
-            'requests': requests,
-            'backoff_until': backoff_until,
-            'last_updated': time.time()
-        }, f)
+        f.write(''.join(f"{t!r}\n" for t in [backoff_until, *requests]))
+
+
+def append_request(timestamp):
+    """Record one request by appending a line instead of rewriting the history."""
+    with open(RATE_LIMIT_FILE, 'a') as f:
+        f.write(f"{timestamp!r}\n")
 
 
 def check_rate_limit():
@@ -47,7 +67,7 @@ def check_rate_limit():
     Check if we're exceeding rate limits.
 
     Returns:
-        tuple: (allowed: bool, wait_time: float)
+        tuple: (allowed: bool, wait_time: float, current_count: int)
     """
     now = time.time()
 
@@ -59,14 +79,17 @@ def check_rate_limit():
         wait_time = backoff_until - now
         print(f"⏸️  In backoff period. Waiting {wait_time:.1f} seconds...",
               file=sys.stderr)
-        return False, wait_time
+        return False, wait_time, len(requests)
 
-    # Remove requests older than 1 minute
-    requests = [t for t in requests if now - t < 60]
+    # Remove requests older than 1 minute (timestamps are recorded in order)
+    stored_count = len(requests)
+    requests = deque(requests)
+    while requests and now - requests[0] >= 60:
+        requests.popleft()
 
     # Check if we've hit the rate limit
     if len(requests) >= MAX_REQUESTS_PER_MINUTE:
-        oldest = min(requests)
+        oldest = requests[0]
         wait_time = 60 - (now - oldest)
         print(f"⏸️  Rate limit reached ({len(requests)}/{MAX_REQUESTS_PER_MINUTE} requests/min).",
               file=sys.stderr)
@@ -74,12 +97,12 @@ def check_rate_limit():
 
         # Set backoff period
         backoff_until = now + wait_time
-        save_request_history(requests, backoff_until)
-        return False, wait_time
+        save_request_history(list(requests), backoff_until)
+        return False, wait_time, len(requests)
 
     # Check minimum delay since last request
     if requests:
-        last_request = max(requests)
+        last_request = requests[-1]
         time_since_last = now - last_request
 
         if time_since_last < MIN_DELAY_SECONDS:
@@ -88,11 +111,15 @@ def check_rate_limit():
             time.sleep(wait_time)
             now = time.time()
 
-    # Record this request
+    # Record this request; expired entries are dropped from the file only
+    # when it has grown past COMPACT_AFTER lines
     requests.append(now)
-    save_request_history(requests)
+    if stored_count == 0 or stored_count >= COMPACT_AFTER:
+        save_request_history(list(requests), backoff_until)
+    else:
+        append_request(now)
 
-    return True, 0
+    return True, 0, len(requests)
 
 
 def is_web_request(tool_name, tool_input):
@@ -115,8 +142,7 @@ def is_web_request(tool_name, tool_input):
         command = tool_input.get('command', '')
 
         # Check for common web request commands
-        web_commands = ['curl', 'wget', 'http', 'https']
-        if any(cmd in command.lower() for cmd in web_commands):
+        if WEB_COMMAND_PATTERN.search(command) is not None:
             return True
 
     return False
@@ -133,7 +159,7 @@ if __name__ == "__main__":
         # Check if this is a web request
         if is_web_request(tool_name, tool_input):
             # Check rate limit
-            allowed, wait_time = check_rate_limit()
+            allowed, wait_time, current_count = check_rate_limit()
 
             if not allowed:
                 # Block the request (exit code 2)
@@ -142,7 +168,7 @@ if __name__ == "__main__":
                 sys.exit(2)  # Exit code 2 blocks the tool call
 
             # Request allowed
-            print(f"✓ Request allowed (rate: {len(load_request_history()[0])}/{MAX_REQUESTS_PER_MINUTE} req/min)",
+            print(f"✓ Request allowed (rate: {current_count}/{MAX_REQUESTS_PER_MINUTE} req/min)",
                   file=sys.stderr)
 
         # Allow the request
@@ -8,7 +8,92 @@ Checks required fields, confidence scores, and data completeness.
 import json
 import sys
 import os
-from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Large job files are parsed in full without ijson
+    ijson = None
+
+
+STREAM_THRESHOLD = 64 * 1024  # Job files at least this large are stream-parsed
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_validation_view(f):
+    """
+    Stream-parse a job file into the subset of it that validation reads.
+
+    The result has the same shape as the full document for validate_job_data
+    and get_quality_grade: every top-level job field is present, scalars keep
+    their value, dict fields keep only their confidence (other keys become
+    True placeholders, and the extraction block is kept whole), and arrays
+    keep only their emptiness. Long nested content is never materialized.
+
+    Args:
+        f: Job file opened in binary mode
+
+    Returns:
+        Reduced job data dict
+    """
+    data = {}
+    job = None
+    field = None
+    field_prefix = None
+    nested_key = None
+
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if job is None:
+            if prefix == 'job' and event == 'start_map':
+                job = data['job'] = {}
+            continue
+
+        if prefix == 'job':
+            if event == 'map_key':
+                field = value
+                field_prefix = f'job.{value}'
+            elif event == 'end_map':
+                # The job object is complete; skip the rest of the file
+                break
+            continue
+
+        if prefix == field_prefix:
+            if event == 'start_map':
+                job[field] = {}
+            elif event == 'start_array':
+                job[field] = []
+            elif event == 'map_key':
+                nested_key = value
+                job[field][value] = True
+            elif event not in ('end_map', 'end_array'):
+                job[field] = value
+        elif prefix == f'{field_prefix}.item':
+            if event not in ('end_map', 'end_array') and not job[field]:
+                job[field].append(True)
+        elif prefix == f'{field_prefix}.{nested_key}':
+            if event not in ('start_map', 'start_array', 'end_map', 'end_array', 'map_key'):
+                if field == 'extraction' or nested_key == 'confidence':
+                    job[field][nested_key] = value
+
+    return data
+
+
+def load_job_file(file_path):
+    """Load a job file, stream-parsing only the validated fields when it is large."""
+    with open(file_path, 'rb') as f:
+        if ijson is None or os.fstat(f.fileno()).st_size < STREAM_THRESHOLD:
+            return _loads(f.read())
+        return load_validation_view(f)
 
 
 def validate_job_data(data):
@@ -106,18 +191,19 @@ def get_quality_grade(data):
 if __name__ == "__main__":
     try:
         # Read hook input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = _loads(sys.stdin.buffer.read())
         file_path = input_data.get('tool_input', {}).get('file_path', '')
 
         # Only validate job JSON files in the output directory
-        if not file_path.startswith('output/jobs/') or not file_path.endswith('.json'):
+        if not (file_path.endswith('.json') and file_path.startswith('output/jobs/')):
             # Not a job file, skip validation
             sys.exit(0)
 
+        file_name = file_path.rsplit('/', 1)[-1]
+
         # Check if file exists and read it
         if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                job_data = json.load(f)
+            job_data = load_job_file(file_path)
 
             # Validate the data
             issues = validate_job_data(job_data)
@@ -127,7 +213,7 @@ if __name__ == "__main__":
 
             # Print validation results
             if issues:
-                print(f"\n📋 Data Validation Results for {Path(file_path).name}")
+                print(f"\n📋 Data Validation Results for {file_name}")
                 print("=" * 60)
                 for issue in issues:
                     print(f"  {issue}")
@@ -139,7 +225,7 @@ if __name__ == "__main__":
                 if critical_issues:
                     print("  ⚡ Action: Manual review recommended\n")
             else:
-                print(f"✅ Data validation passed - Grade: {grade} - {Path(file_path).name}")
+                print(f"✅ Data validation passed - Grade: {grade} - {file_name}")
 
         else:
             print(f"⚠️  File not found: {file_path}", file=sys.stderr)
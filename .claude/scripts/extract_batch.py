@@ -5,29 +5,142 @@ Batch Job Extraction Script
 Extracts job data from karriere.at URLs in batch with:
 - Progress tracking and checkpoints
 - Error handling and retries
-- Rate limiting (2-5 second delays)
+- Concurrent fetching with rate limiting (2-5 second spacing, max 20 requests/min)
 - Quality metrics
 """
 
 import json
+import os
 import sys
+import tempfile
 import time
 import random
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
-from bs4 import BeautifulSoup
+from typing import Dict, List, Any, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
-from html_extractor import HTMLExtractor
+from html_extractor import HTMLExtractor, CompiledSchema
+from url_queue import URLQueue
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+
+MAX_REQUESTS_PER_MINUTE = 20  # Same ceiling as .claude/hooks/rate_limiter.py
+DEFAULT_CONCURRENCY = 5
+PARSE_WORKERS = 4  # Processes parsing fetched HTML
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,de;q=0.8',
+}
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON bytes, indented unless compact output is requested."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# Compiled schema of a parse worker process, set once by _init_parse_worker
+_worker_schema = None
+
+
+def _init_parse_worker(compiled: CompiledSchema) -> None:
+    """Process pool initializer: keep the schema so tasks only ship HTML."""
+    global _worker_schema
+    _worker_schema = compiled
+
+
+def _parse_and_score(html: str) -> Dict:
+    """
+    Extract job data from HTML and grade it (runs in a parse worker process).
+
+    Args:
+        html: Fetched page HTML
+
+    Returns:
+        Extraction result with extraction.qualityGrade set
+    """
+    result = _worker_schema.extract(html)
+
+    # Calculate quality grade
+    completeness = result['extraction'].get('dataCompleteness', 0)
+    confidence = result['extraction'].get('averageConfidence', 0)
+
+    if completeness >= 80 and confidence >= 75:
+        grade = "A"
+    elif completeness >= 70 and confidence >= 65:
+        grade = "B"
+    elif completeness >= 50 and confidence >= 55:
+        grade = "C"
+    else:
+        grade = "D"
+
+    result['extraction']['qualityGrade'] = grade
+    return result
+
+
+class RequestPacer:
+    """Thread-safe pacing of request starts shared by all fetch workers."""
+
+    def __init__(self, max_per_minute: int = MAX_REQUESTS_PER_MINUTE,
+                 min_delay: float = 2, max_delay: float = 5):
+        """
+        Initialize request pacer.
+
+        Args:
+            max_per_minute: Maximum request starts in any 60-second window
+            min_delay: Minimum spacing between request starts in seconds
+            max_delay: Maximum spacing between request starts in seconds
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._starts = deque(maxlen=max_per_minute)
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        """Block until the caller may start its request."""
+        with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+
+            # Window full: wait until the oldest start leaves it
+            if len(self._starts) == self._starts.maxlen:
+                slot = max(slot, self._starts[0] + 60)
+
+            self._starts.append(slot)
+            self._next_slot = slot + random.uniform(self.min_delay, self.max_delay)
+
+        time.sleep(max(0.0, slot - time.monotonic()))
 
 
 class BatchExtractor:
     """Extract multiple jobs in batch."""
 
-    def __init__(self, session_dir: str, start_id: int, end_id: int):
+    def __init__(self, session_dir: str, start_id: int, end_id: int,
+                 concurrency: int = DEFAULT_CONCURRENCY):
         """
         Initialize batch extractor.
 
@@ -35,10 +148,24 @@ class BatchExtractor:
             session_dir: Session output directory
             start_id: Starting job ID (inclusive)
             end_id: Ending job ID (inclusive)
+            concurrency: Number of jobs fetched in parallel
         """
         self.session_dir = Path(session_dir)
         self.start_id = start_id
         self.end_id = end_id
+        self.concurrency = max(1, concurrency)
+        self.pacer = RequestPacer()
+
+        # Keep-alive session shared by all fetch workers (one pooled host)
+        self.session = requests.Session()
+        self.session.headers.update(REQUEST_HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.concurrency,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
         # Load configuration
         self.base_dir = Path(__file__).parent.parent.parent
@@ -59,6 +186,7 @@ class BatchExtractor:
         # Load data
         self.queue = self._load_queue()
         self.schema = self._load_schema()
+        self.compiled = HTMLExtractor.compile(self.schema)
 
         # Statistics
         self.stats = {
@@ -72,24 +200,40 @@ class BatchExtractor:
         }
 
     def _load_queue(self) -> Dict:
-        """Load URL queue."""
-        with open(self.queue_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Load URL queue, including updates still in its mutation log."""
+        queue = URLQueue(str(self.queue_file))
+        if not queue.load():
+            raise ValueError(f"Could not load URL queue: {self.queue_file}")
+        return queue.queue_data
 
     def _load_schema(self) -> Dict:
         """Load extraction schema."""
-        with open(self.schema_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _loads(self.schema_file.read_bytes())
 
-    def _save_checkpoint(self):
-        """Save progress checkpoint."""
+    def _save_checkpoint(self, final: bool = False):
+        """
+        Save progress checkpoint.
+
+        Args:
+            final: Pretty-print the end-of-run checkpoint; periodic ones are compact
+        """
         checkpoint = {
             "last_processed_id": self.current_id,
             "stats": self.stats,
             "timestamp": datetime.now().isoformat()
         }
-        with open(self.checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+
+        # Write to a temp file and rename so a crash never leaves a torn checkpoint
+        tmp = tempfile.NamedTemporaryFile(mode='wb', delete=False,
+                                          dir=str(self.checkpoint_file.parent),
+                                          prefix='.checkpoint.', suffix='.tmp')
+        try:
+            with tmp:
+                tmp.write(_dumps(checkpoint, indent=final))
+            os.replace(tmp.name, self.checkpoint_file)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
 
     def _fetch_html(self, url: str) -> str:
         """
@@ -101,13 +245,7 @@ class BatchExtractor:
         Returns:
             HTML content
         """
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,de;q=0.8',
-        }
-
-        response = requests.get(url, headers=headers, timeout=30)
+        response = self.session.get(url, timeout=(5, 30))
         response.raise_for_status()
 
         return response.text
@@ -127,13 +265,12 @@ class BatchExtractor:
 
         try:
             # Fetch HTML
-            print(f"  Fetching {url}...", flush=True)
+            self.pacer.wait()
             html = self._fetch_html(url)
 
-            # Extract data
-            print(f"  Extracting data...", flush=True)
-            extractor = HTMLExtractor(html, self.schema)
-            result = extractor.extract_all()
+            # Extract data in a worker process while other fetches continue
+            result = self.parse_pool.submit(_parse_and_score, html).result()
+            grade = result['extraction']['qualityGrade']
 
             # Add metadata
             result['job']['id'] = str(job_id)
@@ -146,21 +283,6 @@ class BatchExtractor:
                 "sourceCompany": job.get('company', '')
             }
 
-            # Calculate quality grade
-            completeness = result['extraction'].get('dataCompleteness', 0)
-            confidence = result['extraction'].get('averageConfidence', 0)
-
-            if completeness >= 80 and confidence >= 75:
-                grade = "A"
-            elif completeness >= 70 and confidence >= 65:
-                grade = "B"
-            elif completeness >= 50 and confidence >= 55:
-                grade = "C"
-            else:
-                grade = "D"
-
-            result['extraction']['qualityGrade'] = grade
-
             return {
                 "success": True,
                 "job_id": job_id,
@@ -220,48 +342,66 @@ class BatchExtractor:
         print(f"Total jobs to process: {total_jobs}")
         print("=" * 60)
 
-        for idx, job in enumerate(jobs_to_process, 1):
-            self.current_id = job['id']
-            job_id = job['id']
-            title = job.get('title', 'Unknown')
+        # Threads fetch concurrently and hand HTML to parse processes;
+        # results are handled in queue order
+        self.parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                              initializer=_init_parse_worker,
+                                              initargs=(self.compiled,))
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            results = executor.map(self._extract_job, jobs_to_process)
 
-            print(f"\n[{idx}/{total_jobs}] Job #{job_id}: {title}")
+            for idx, (job, result) in enumerate(zip(jobs_to_process, results), 1):
+                self.current_id = job['id']
+                job_id = job['id']
+                title = job.get('title', 'Unknown')
 
-            # Extract job
-            result = self._extract_job(job)
+                print(f"\n[{idx}/{total_jobs}] Job #{job_id}: {title}")
+                print(f"  {job['url']}")
 
-            # Save result
-            self._save_job(result)
+                # Save result
+                self._save_job(result)
 
-            # Update stats
-            self.stats['processed'] += 1
-
-            # Print result
-            if result['success']:
-                grade = result['quality_grade']
-                confidence = result['data']['extraction'].get('averageConfidence', 0)
-                completeness = result['data']['extraction'].get('dataCompleteness', 0)
-                print(f"  ✓ Grade: {grade} | Confidence: {confidence}% | Complete: {completeness}%")
-            else:
-                print(f"  ✗ Failed: {result['error']}")
+                # Update stats
+                self.stats['processed'] += 1
 
-            # Save checkpoint every 10 jobs
-            if self.stats['processed'] % 10 == 0:
-                self._save_checkpoint()
-                self._print_progress()
+                # Print result
+                if result['success']:
+                    grade = result['quality_grade']
+                    confidence = result['data']['extraction'].get('averageConfidence', 0)
+                    completeness = result['data']['extraction'].get('dataCompleteness', 0)
+                    print(f"  ✓ Grade: {grade} | Confidence: {confidence}% | Complete: {completeness}%")
+                else:
+                    print(f"  ✗ Failed: {result['error']}")
 
-            # Rate limiting (2-5 seconds)
-            if idx < total_jobs:  # Don't delay after last job
-                delay = random.uniform(2, 5)
-                print(f"  Waiting {delay:.1f}s...", flush=True)
-                time.sleep(delay)
+                # Save checkpoint every 10 jobs
+                if self.stats['processed'] % 10 == 0:
+                    self._save_checkpoint()
+                    self._print_progress()
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.parse_pool.shutdown(wait=True, cancel_futures=True)
+            self.session.close()
 
         # Final checkpoint
-        self._save_checkpoint()
+        self._save_checkpoint(final=True)
 
         # Print final summary
         self._print_summary()
 
+    def _quality_averages(self) -> Optional[Tuple[float, float]]:
+        """
+        Average confidence and completeness over extracted jobs.
+
+        Returns:
+            (avg_confidence, avg_completeness), or None before any job was extracted
+        """
+        scored = self.stats['successful'] + self.stats['incomplete']
+        if not scored:
+            return None
+        return self.stats['total_confidence'] / scored, self.stats['total_completeness'] / scored
+
     def _print_progress(self):
         """Print progress update."""
         print("\n" + "=" * 60)
@@ -271,9 +411,9 @@ class BatchExtractor:
         print(f"Incomplete: {self.stats['incomplete']}")
         print(f"Failed: {self.stats['failed']}")
 
-        if self.stats['successful'] + self.stats['incomplete'] > 0:
-            avg_conf = self.stats['total_confidence'] / (self.stats['successful'] + self.stats['incomplete'])
-            avg_comp = self.stats['total_completeness'] / (self.stats['successful'] + self.stats['incomplete'])
+        averages = self._quality_averages()
+        if averages:
+            avg_conf, avg_comp = averages
             print(f"Avg Confidence: {avg_conf:.1f}%")
             print(f"Avg Completeness: {avg_comp:.1f}%")
 
@@ -290,9 +430,9 @@ class BatchExtractor:
         print(f"  ~ Incomplete: {self.stats['incomplete']}")
         print(f"  ✗ Failed: {self.stats['failed']}")
 
-        if self.stats['successful'] + self.stats['incomplete'] > 0:
-            avg_conf = self.stats['total_confidence'] / (self.stats['successful'] + self.stats['incomplete'])
-            avg_comp = self.stats['total_completeness'] / (self.stats['successful'] + self.stats['incomplete'])
+        averages = self._quality_averages()
+        if averages:
+            avg_conf, avg_comp = averages
             print(f"\nQuality Metrics:")
             print(f"  Avg Confidence: {avg_conf:.1f}%")
             print(f"  Avg Completeness: {avg_comp:.1f}%")
@@ -311,15 +451,16 @@ class BatchExtractor:
 
 def main():
     """Main entry point."""
-    if len(sys.argv) != 4:
-        print("Usage: python extract_batch.py <session_dir> <start_id> <end_id>")
+    if len(sys.argv) not in (4, 5):
+        print("Usage: python extract_batch.py <session_dir> <start_id> <end_id> [concurrency]")
         sys.exit(1)
 
     session_dir = sys.argv[1]
     start_id = int(sys.argv[2])
     end_id = int(sys.argv[3])
+    concurrency = int(sys.argv[4]) if len(sys.argv) == 5 else DEFAULT_CONCURRENCY
 
-    extractor = BatchExtractor(session_dir, start_id, end_id)
+    extractor = BatchExtractor(session_dir, start_id, end_id, concurrency)
     extractor.extract_batch()
 
 
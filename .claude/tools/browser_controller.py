@@ -3,17 +3,153 @@
 Browser Controller Tool
 
 Controls Selenium WebDriver with anti-detection measures for scraping.
+
+The check_captcha action reads the page from "html", or from "html_gz"
+(base64 of the zlib/gzip-compressed UTF-8 HTML) for large pages.
 """
 
+import json
+import re
 import time
 import random
-from typing import Optional, Tuple, List
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from selenium_stealth import stealth
+import sys
+import types
+from pathlib import Path
+from typing import Optional, Tuple, List, Dict, TYPE_CHECKING
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # No profile locking where flock is unavailable
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+# Selenium and selenium-stealth are imported where a browser is needed, so
+# browser-free actions such as check_captcha start quickly
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+
+# Page-side CAPTCHA check: returns the CAPTCHA type or null
+CAPTCHA_CHECK_SCRIPT = """
+const html = document.documentElement.outerHTML.toLowerCase();
+if (html.includes('recaptcha')) return 'recaptcha';
+if (html.includes('hcaptcha') || html.includes('h-captcha')) return 'hcaptcha';
+if (html.includes('cloudflare') && html.includes('challenge')) return 'cloudflare';
+for (const iframe of document.querySelectorAll('iframe')) {
+    const src = iframe.src || '';
+    if (src.includes('recaptcha')) return 'recaptcha';
+    if (src.includes('captcha')) return 'hcaptcha';
+}
+return null;
+"""
+
+# Resource hints for the origin passed as arguments[0]
+PRECONNECT_SCRIPT = """
+const parent = document.head || document.documentElement;
+for (const rel of ['dns-prefetch', 'preconnect']) {
+    const link = document.createElement('link');
+    link.rel = rel;
+    link.href = arguments[0];
+    parent.appendChild(link);
+}
+"""
+
+# In-page scroll loops; each resolves the async script callback when done
+SCROLL_SCRIPT_TIMEOUT = 120  # Seconds allowed for a whole scroll loop
+
+NATURAL_SCROLL_SCRIPT = """
+const done = arguments[arguments.length - 1];
+// Height is read once so infinite-scroll pages still reach an end
+const totalHeight = document.body.scrollHeight;
+const viewportHeight = window.innerHeight;
+let position = 0;
+const step = () => {
+    if (position >= totalHeight) return done(null);
+    // Scroll by viewport with some variance, then pause 0.3-0.8s
+    position += Math.floor(viewportHeight * (0.5 + Math.random() * 0.4));
+    window.scrollTo(0, position);
+    setTimeout(step, 300 + Math.random() * 500);
+};
+step();
+"""
+
+RANDOM_SCROLL_SCRIPT = """
+let remaining = arguments[0];
+const done = arguments[arguments.length - 1];
+const step = () => {
+    if (remaining-- <= 0) return done(null);
+    window.scrollTo(0, Math.floor(Math.random() * 10001));
+    setTimeout(step, 300 + Math.random() * 400);
+};
+step();
+"""
+
+MAX_TABS = 6  # Tabs loading at once in navigate_batch
+
+# fast_navigate: server-rendered pages shorter than this are assumed to need JS
+MIN_STATIC_HTML_LENGTH = 5000
+# Markers of a client-rendered shell: a noscript JS notice or an empty app root
+JS_SHELL_PATTERN = re.compile(
+    r'<noscript[^>]*>[^<]*(?:enable|requires?)\s+javascript'
+    r'|<div\s+id="(?:root|app|__next)"\s*>\s*</div>',
+    re.IGNORECASE
+)
+# Challenge markers that are visible without running JS
+STATIC_CAPTCHA_MARKERS = ('recaptcha', 'hcaptcha', 'h-captcha', 'cf-chl', 'challenge-platform')
+
+# Persistent profile so the browser's HTTP cache survives between runs
+DEFAULT_PROFILE_DIR = Path.home() / ".cache" / "jobhunter" / "chrome"
+DISK_CACHE_SIZE = 512 * 1024 * 1024  # Bytes
+
+# Address of the long-lived browser started with --daemon
+SESSION_FILE = Path.home() / ".jobhunter_session"
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """Serialize to a compact JSON string."""
+    if orjson:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+def _attach_remote(executor_url: str, session_id: str) -> "RemoteWebDriver":
+    """
+    Attach a Remote driver to an existing WebDriver session.
+
+    webdriver.Remote always requests a new session on construction, so the
+    newSession command is answered locally with the stored session id. The
+    override is bound to this one instance only while it is constructed.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+    def execute(self, driver_command, params=None):
+        if driver_command == "newSession":
+            return {"value": {"sessionId": session_id, "capabilities": {}}}
+        return RemoteWebDriver.execute(self, driver_command, params)
+
+    driver = RemoteWebDriver.__new__(RemoteWebDriver)
+    driver.execute = types.MethodType(execute, driver)
+    try:
+        RemoteWebDriver.__init__(driver, command_executor=executor_url,
+                                 options=webdriver.ChromeOptions())
+    finally:
+        del driver.execute
+
+    driver.session_id = session_id
+    return driver
 
 
 class BrowserController:
@@ -26,11 +162,19 @@ class BrowserController:
         Args:
             headless: Run browser in headless mode
             user_data_dir: Path to Chrome user data directory for session persistence
+                           (defaults to DEFAULT_PROFILE_DIR)
         """
         self.driver = None
         self.headless = headless
-        self.user_data_dir = user_data_dir
+        self.user_data_dir = user_data_dir or str(DEFAULT_PROFILE_DIR)
+        self._profile_lock = None  # Held while this controller's Chrome uses the profile
         self.current_user_agent = None
+        self.attached = False  # Driver belongs to a --daemon browser
+        self.executor_url = None  # WebDriver server address of the running browser
+        self.preconnected_hosts = set()  # Origins already given connection hints
+        self._document_node_id = None  # CDP node id of the current document
+        self._http = None  # requests.Session used by fast_navigate
+        self._last_html = None  # Page fetched by fast_navigate, if it is current
 
         # User agent rotation
         self.user_agents = [
@@ -40,10 +184,17 @@ class BrowserController:
         ]
 
     def start(self) -> None:
-        """Start browser with anti-detection measures."""
+        """Start browser with anti-detection measures, reusing a daemon browser if one is running."""
         if self.driver:
             return  # Already started
 
+        if self._attach():
+            return
+
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium_stealth import stealth
+
         # Select random user agent
         self.current_user_agent = random.choice(self.user_agents)
 
@@ -54,8 +205,10 @@ class BrowserController:
         if self.headless:
             options.add_argument("--headless=new")
 
-        if self.user_data_dir:
+        if self._lock_profile():
             options.add_argument(f"--user-data-dir={self.user_data_dir}")
+            options.add_argument(f"--disk-cache-dir={Path(self.user_data_dir) / 'Cache'}")
+            options.add_argument(f"--disk-cache-size={DISK_CACHE_SIZE}")
 
         # Anti-detection measures
         options.add_argument("--disable-blink-features=AutomationControlled")
@@ -63,7 +216,13 @@ class BrowserController:
         options.add_experimental_option("useAutomationExtension", False)
 
         # Start browser
-        self.driver = webdriver.Chrome(options=options)
+        try:
+            service = Service()
+            self.driver = webdriver.Chrome(service=service, options=options)
+            self.executor_url = service.service_url
+        except Exception:
+            self._release_profile()
+            raise
 
         # Apply selenium-stealth
         stealth(
@@ -76,11 +235,114 @@ class BrowserController:
             fix_hairline=True,
         )
 
+    def _lock_profile(self) -> bool:
+        """
+        Claim the profile directory so only one Chrome uses it at a time.
+
+        Returns:
+            True if this controller may use the profile
+        """
+        profile_dir = Path(self.user_data_dir)
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        lock = open(profile_dir / ".jobhunter.lock", 'w')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock.close()
+                print(f"⚠️  Chrome profile in use, starting without it: {profile_dir}",
+                      file=sys.stderr)
+                return False
+
+        self._profile_lock = lock
+        return True
+
+    def _release_profile(self) -> None:
+        """Release the profile directory lock, if held."""
+        if self._profile_lock:
+            self._profile_lock.close()
+            self._profile_lock = None
+
+    def _attach(self) -> bool:
+        """
+        Attach to the browser recorded in SESSION_FILE.
+
+        Returns:
+            True if attached to a live session
+        """
+        try:
+            session = json.loads(SESSION_FILE.read_text())
+        except (FileNotFoundError, ValueError):
+            return False
+
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            driver = _attach_remote(session["executor_url"], session["session_id"])
+            driver.current_url  # Fails if the daemon browser is gone
+        except (KeyError, WebDriverException):
+            SESSION_FILE.unlink(missing_ok=True)
+            return False
+
+        daemon_headless = session.get("headless")
+        if daemon_headless is not None and daemon_headless != self.headless:
+            mode = "headless" if daemon_headless else "headed"
+            # stderr, so the JSON result on stdout stays parseable
+            print(f"⚠️  Attached to a {mode} daemon browser; the headless setting is ignored",
+                  file=sys.stderr)
+
+        self.driver = driver
+        self.attached = True
+        self.executor_url = session["executor_url"]
+        self.current_user_agent = session.get("user_agent")
+        return True
+
     def stop(self) -> None:
-        """Stop browser and clean up."""
+        """Stop browser and clean up (detaches only from a daemon browser)."""
+        if self.driver:
+            if not self.attached:
+                self.driver.quit()
+                self._release_profile()
+            self.driver = None
+            self.attached = False
+            self.executor_url = None
+
+    def shutdown(self) -> None:
+        """Quit the browser even when it is a shared daemon browser."""
         if self.driver:
             self.driver.quit()
+            self._release_profile()
             self.driver = None
+            self.attached = False
+            self.executor_url = None
+            SESSION_FILE.unlink(missing_ok=True)
+
+    def serve(self) -> None:
+        """
+        Run as the daemon browser: start Chrome, publish its session in
+        SESSION_FILE and keep it alive until interrupted.
+        """
+        self.start()
+        if self.attached:
+            print(f"Browser daemon already running ({SESSION_FILE})")
+            return
+
+        SESSION_FILE.write_text(json.dumps({
+            "executor_url": self.executor_url,
+            "session_id": self.driver.session_id,
+            "user_agent": self.current_user_agent,
+            "headless": self.headless
+        }))
+        print(f"Browser daemon running, session written to {SESSION_FILE}")
+
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
 
     def navigate(self, url: str, timeout: int = 30) -> bool:
         """
@@ -96,8 +358,17 @@ class BrowserController:
         if not self.driver:
             self.start()
 
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        self._last_html = None
+
         try:
+            self._preconnect(url)
             self.driver.get(url)
+            self._document_node_id = None
 
             # Wait for page to load
             WebDriverWait(self.driver, timeout).until(
@@ -116,6 +387,155 @@ class BrowserController:
             print(f"❌ Error loading {url}: {e}")
             return False
 
+    def fast_navigate(self, url: str, timeout: int = 10) -> bool:
+        """
+        Load URL with a plain HTTP request, escalating to the browser when needed.
+
+        The browser is only used when the server refuses the request or the
+        response looks like a page that renders its content with JavaScript.
+
+        Args:
+            url: Target URL
+            timeout: HTTP timeout in seconds
+
+        Returns:
+            True if successful
+        """
+        import requests
+
+        if self._http is None:
+            self._http = requests.Session()
+
+        # Same identity as the browser: user agent and current cookies
+        if not self.current_user_agent:
+            self.current_user_agent = random.choice(self.user_agents)
+        for cookie in self.get_cookies():
+            self._http.cookies.set(cookie['name'], cookie['value'],
+                                   domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+        try:
+            response = self._http.get(url, headers={"User-Agent": self.current_user_agent},
+                                      timeout=timeout)
+        except requests.RequestException:
+            return self.navigate(url)
+
+        if response.status_code in (403, 429) or not response.ok or self._needs_js(response.text):
+            return self.navigate(url)
+
+        self._last_html = response.text
+        return True
+
+    @staticmethod
+    def _needs_js(html: str) -> bool:
+        """
+        Decide whether a server-rendered page must be loaded in the browser.
+
+        Args:
+            html: Page HTML returned by the server
+
+        Returns:
+            True if the content is likely incomplete without JavaScript
+        """
+        lowered = html.lower()
+        if any(marker in lowered for marker in STATIC_CAPTCHA_MARKERS):
+            return False  # The challenge is already visible
+
+        if len(html) < MIN_STATIC_HTML_LENGTH:
+            return True
+
+        return JS_SHELL_PATTERN.search(html) is not None
+
+    def navigate_batch(self, urls: List[str], max_tabs: int = MAX_TABS,
+                       timeout: int = 30) -> Dict[str, Optional[str]]:
+        """
+        Load several URLs concurrently in separate tabs and collect their HTML.
+
+        Args:
+            urls: Target URLs
+            max_tabs: Maximum number of tabs loading at once
+            timeout: Page load timeout per tab in seconds
+
+        Returns:
+            Dict of url -> page HTML (None if the page failed to load)
+        """
+        if not self.driver:
+            self.start()
+
+        from selenium.common.exceptions import WebDriverException
+
+        self._last_html = None
+        results = {}
+        main_handle = self.driver.current_window_handle
+
+        for i in range(0, len(urls), max_tabs):
+            # Open a batch of tabs; they load in parallel inside the browser
+            tabs = {}
+            for url in urls[i:i + max_tabs]:
+                known = set(self.driver.window_handles)
+                self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+                opened = [h for h in self.driver.window_handles if h not in known]
+                if opened:
+                    tabs[opened[0]] = url
+                else:
+                    results[url] = None
+
+            # Collect each tab once loaded, then close it
+            for handle, url in tabs.items():
+                self.driver.switch_to.window(handle)
+                self._document_node_id = None
+                try:
+                    results[url] = self.get_html() if self._wait_for_load(timeout) else None
+                except WebDriverException as e:
+                    print(f"❌ Error loading {url}: {e}")
+                    results[url] = None
+                finally:
+                    self.driver.close()
+
+            self.driver.switch_to.window(main_handle)
+            self._document_node_id = None
+
+        return results
+
+    def _wait_for_load(self, timeout: int) -> bool:
+        """
+        Wait until the current tab has left about:blank and finished loading.
+
+        Args:
+            timeout: Maximum wait in seconds
+
+        Returns:
+            True if the page loaded in time
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            href, state = self.driver.execute_script(
+                "return [location.href, document.readyState];"
+            )
+            if href != "about:blank" and state == "complete":
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.2)
+
+    def _preconnect(self, url: str) -> None:
+        """
+        Hint DNS lookup and connection setup for a new origin before navigating.
+
+        Args:
+            url: URL about to be loaded
+        """
+        parsed = urlparse(url)
+        if not parsed.netloc:
+            return
+
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin in self.preconnected_hosts:
+            return
+        self.preconnected_hosts.add(origin)
+
+        self.driver.get("about:blank")
+        self.driver.execute_script(PRECONNECT_SCRIPT, origin)
+
     def get_html(self) -> str:
         """
         Get current page HTML.
@@ -123,10 +543,34 @@ class BrowserController:
         Returns:
             Page source HTML
         """
+        if self._last_html is not None:
+            return self._last_html
+
         if not self.driver:
             return ""
 
-        return self.driver.page_source
+        # Attached Remote drivers have no CDP access
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return self.driver.page_source
+
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            return self._get_outer_html()
+        except WebDriverException:
+            # Cached node id went stale (the page navigated); look it up again
+            self._document_node_id = None
+            return self._get_outer_html()
+
+    def _get_outer_html(self) -> str:
+        """Serialize the current document through CDP DOM.getOuterHTML."""
+        if self._document_node_id is None:
+            document = self.driver.execute_cdp_cmd("DOM.getDocument", {"depth": 0})
+            self._document_node_id = document["root"]["nodeId"]
+
+        return self.driver.execute_cdp_cmd(
+            "DOM.getOuterHTML", {"nodeId": self._document_node_id}
+        )["outerHTML"]
 
     def scroll_page(self, strategy: str = "natural") -> None:
         """
@@ -142,22 +586,8 @@ class BrowserController:
             return
 
         if strategy == "natural":
-            # Natural scrolling in steps
-            total_height = self.driver.execute_script("return document.body.scrollHeight")
-            viewport_height = self.driver.execute_script("return window.innerHeight")
-
-            current_position = 0
-            while current_position < total_height:
-                # Scroll by viewport with some variance
-                scroll_amount = random.randint(
-                    int(viewport_height * 0.5), int(viewport_height * 0.9)
-                )
-                current_position += scroll_amount
-
-                self.driver.execute_script(f"window.scrollTo(0, {current_position});")
-
-                # Random delay between scrolls
-                time.sleep(random.uniform(0.3, 0.8))
+            # Natural scrolling in steps, run as one script in the page
+            self._run_scroll_script(NATURAL_SCROLL_SCRIPT)
 
         elif strategy == "full":
             # Scroll to bottom immediately
@@ -167,11 +597,28 @@ class BrowserController:
             time.sleep(1)
 
         elif strategy == "random":
-            # Random scroll positions
-            for _ in range(random.randint(3, 6)):
-                position = random.randint(0, 10000)
-                self.driver.execute_script(f"window.scrollTo(0, {position});")
-                time.sleep(random.uniform(0.3, 0.7))
+            # Random scroll positions, run as one script in the page
+            self._run_scroll_script(RANDOM_SCROLL_SCRIPT, random.randint(3, 6))
+
+    def _run_scroll_script(self, script: str, *args) -> None:
+        """
+        Run an async scroll loop, keeping the page usable if it overruns.
+
+        Args:
+            script: Async script that calls its callback when scrolling is done
+            *args: Arguments passed to the script
+        """
+        from selenium.common.exceptions import ScriptTimeoutException, TimeoutException
+
+        previous_timeout = self.driver.timeouts.script
+        self.driver.set_script_timeout(SCROLL_SCRIPT_TIMEOUT)
+        try:
+            self.driver.execute_async_script(script, *args)
+        except (ScriptTimeoutException, TimeoutException):
+            print(f"⚠️  Scrolling stopped after {SCROLL_SCRIPT_TIMEOUT}s", file=sys.stderr)
+        finally:
+            # Restore the timeout, which otherwise persists in a shared daemon session
+            self.driver.set_script_timeout(previous_timeout)
 
     def click_element(self, selector: str, by: str = "css") -> bool:
         """
@@ -187,6 +634,10 @@ class BrowserController:
         if not self.driver:
             return False
 
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             # Convert selector type
             by_mapping = {
@@ -223,31 +674,35 @@ class BrowserController:
         Returns:
             Tuple of (has_captcha, captcha_type)
         """
+        if self._last_html is not None:
+            return self._check_static_captcha(self._last_html)
+
         if not self.driver:
             return False, None
 
-        html = self.get_html().lower()
+        from selenium.common.exceptions import WebDriverException
 
-        # Check for common CAPTCHA types
-        if "recaptcha" in html or "g-recaptcha" in html:
-            return True, "recaptcha"
+        # Evaluate in the browser so only the verdict crosses the driver boundary
+        try:
+            captcha_type = self.driver.execute_script(CAPTCHA_CHECK_SCRIPT)
+        except WebDriverException:
+            return False, None
 
-        if "hcaptcha" in html or "h-captcha" in html:
-            return True, "hcaptcha"
+        return captcha_type is not None, captcha_type
 
-        if "cloudflare" in html and "challenge" in html:
-            return True, "cloudflare"
+    @staticmethod
+    def _check_static_captcha(html: str) -> Tuple[bool, Optional[str]]:
+        """Apply CAPTCHA_CHECK_SCRIPT's checks to HTML fetched without the browser."""
+        html = html.lower()
 
-        # Check for common CAPTCHA iframes
-        try:
-            iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-            for iframe in iframes:
-                src = iframe.get_attribute("src") or ""
-                if "recaptcha" in src or "hcaptcha" in src or "captcha" in src:
-                    captcha_type = "recaptcha" if "recaptcha" in src else "hcaptcha"
-                    return True, captcha_type
-        except:
-            pass
+        if 'recaptcha' in html:
+            return True, "recaptcha"
+        if 'hcaptcha' in html or 'h-captcha' in html:
+            return True, "hcaptcha"
+        if 'cloudflare' in html and 'challenge' in html:
+            return True, "cloudflare"
+        if re.search(r'<iframe[^>]+src="[^"]*captcha', html):
+            return True, "hcaptcha"
 
         return False, None
 
@@ -300,86 +755,120 @@ class BrowserController:
         self.stop()
 
 
-# JSON I/O Interface for Agent Calls
-if __name__ == "__main__":
-    import json
-    import sys
+def _dispatch(browser: BrowserController, input_data: dict) -> dict:
+    """
+    Run one JSON I/O action against a browser, leaving it running.
 
-    try:
-        # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
-        action = input_data.get("action")
+    Args:
+        browser: Controller shared by the actions of this invocation
+        input_data: Action request
 
-        result = {"success": False, "error": None}
+    Returns:
+        Action result
+    """
+    action = input_data.get("action")
 
-        # Initialize browser
-        headless = input_data.get("headless", False)
-        browser = BrowserController(headless=headless)
+    if action == "navigate":
+        # Navigate to URL and return HTML
+        url = input_data.get("url")
+        browser.start()
 
-        if action == "navigate":
-            # Navigate to URL and return HTML
-            url = input_data.get("url")
-            browser.start()
+        if browser.navigate(url):
+            html = browser.get_html()
+            has_captcha, captcha_type = browser.check_for_captcha()
 
-            if browser.navigate(url):
-                html = browser.get_html()
-                has_captcha, captcha_type = browser.check_for_captcha()
+            return {
+                "success": True,
+                "html": html,
+                "url": url,
+                "has_captcha": has_captcha,
+                "captcha_type": captcha_type
+            }
 
-                result = {
-                    "success": True,
-                    "html": html,
-                    "url": url,
-                    "has_captcha": has_captcha,
-                    "captcha_type": captcha_type
-                }
-            else:
-                result = {"success": False, "error": "Failed to navigate to URL"}
+        return {"success": False, "error": "Failed to navigate to URL"}
 
-            browser.stop()
+    elif action == "scroll_and_get":
+        # Navigate, scroll, and return HTML
+        url = input_data.get("url")
+        scroll_strategy = input_data.get("scroll_strategy", "natural")
+
+        browser.start()
+
+        if browser.navigate(url):
+            browser.scroll_page(scroll_strategy)
+            html = browser.get_html()
+
+            return {
+                "success": True,
+                "html": html,
+                "url": url
+            }
+
+        return {"success": False, "error": "Failed to navigate to URL"}
+
+    elif action == "check_captcha":
+        # Just check for CAPTCHA on provided HTML
+        if "html_gz" in input_data:
+            import base64
+            import zlib
+            # wbits=47 accepts both zlib and gzip framing
+            html = zlib.decompress(base64.b64decode(input_data["html_gz"]), 47).decode('utf-8', 'replace')
+        else:
+            html = input_data.get("html", "")
+        # For CAPTCHA check, we can work with raw HTML without browser
+        has_captcha = "recaptcha" in html.lower() or "hcaptcha" in html.lower()
+        captcha_type = None
+        if "recaptcha" in html.lower():
+            captcha_type = "recaptcha"
+        elif "hcaptcha" in html.lower():
+            captcha_type = "hcaptcha"
+
+        return {
+            "success": True,
+            "has_captcha": has_captcha,
+            "captcha_type": captcha_type
+        }
+
+    return {"success": False, "error": f"Unknown action: {action}"}
 
-        elif action == "scroll_and_get":
-            # Navigate, scroll, and return HTML
-            url = input_data.get("url")
-            scroll_strategy = input_data.get("scroll_strategy", "natural")
 
-            browser.start()
+# JSON I/O Interface for Agent Calls
+# Run with --daemon to keep one browser alive that later calls attach to.
+# The "batch" action runs its "actions" list against one browser.
+if __name__ == "__main__":
+    if "--daemon" in sys.argv[1:]:
+        BrowserController(headless="--headless" in sys.argv[1:]).serve()
+        sys.exit(0)
 
-            if browser.navigate(url):
-                browser.scroll_page(scroll_strategy)
-                html = browser.get_html()
+    try:
+        # Read JSON input from stdin
+        input_data = _loads(sys.stdin.buffer.read())
+        action = input_data.get("action")
 
+        # Initialize browser
+        headless = input_data.get("headless", False)
+        browser = BrowserController(headless=headless)
+
+        try:
+            if action == "batch":
+                # A failing sub-action is reported in place; the rest still run
+                results = []
+                for sub in input_data.get("actions", []):
+                    try:
+                        results.append(_dispatch(browser, sub))
+                    except Exception as e:
+                        results.append({"success": False, "error": str(e)})
                 result = {
-                    "success": True,
-                    "html": html,
-                    "url": url
+                    "success": all(r.get("success") for r in results),
+                    "results": results
                 }
             else:
-                result = {"success": False, "error": "Failed to navigate to URL"}
-
+                result = _dispatch(browser, input_data)
+        finally:
             browser.stop()
 
-        elif action == "check_captcha":
-            # Just check for CAPTCHA on provided HTML
-            html = input_data.get("html", "")
-            # For CAPTCHA check, we can work with raw HTML without browser
-            has_captcha = "recaptcha" in html.lower() or "hcaptcha" in html.lower()
-            captcha_type = None
-            if "recaptcha" in html.lower():
-                captcha_type = "recaptcha"
-            elif "hcaptcha" in html.lower():
-                captcha_type = "hcaptcha"
-
-            result = {
-                "success": True,
-                "has_captcha": has_captcha,
-                "captcha_type": captcha_type
-            }
-
-        else:
-            result = {"success": False, "error": f"Unknown action: {action}"}
-
         # Output JSON result to stdout
-        print(json.dumps(result))
+        print(_dumps(result))
         sys.exit(0)
 
     except Exception as e:
@@ -388,5 +877,5 @@ if __name__ == "__main__":
             "success": False,
             "error": str(e)
         }
-        print(json.dumps(error_result))
+        print(_dumps(error_result))
         sys.exit(1)
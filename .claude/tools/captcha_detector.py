@@ -5,9 +5,158 @@ CAPTCHA Detector
 Detects various types of CAPTCHAs and anti-bot measures in web pages.
 """
 
+import json
 import re
+import sys
+from functools import partial
 from typing import Tuple, Optional, Dict
-from bs4 import BeautifulSoup
+
+# Prefer selectolax's Lexbor parser, then lxml with precompiled XPath;
+# html.parser is the pure-Python fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+if LexborHTMLParser is None and lxml is None:
+    from bs4 import BeautifulSoup
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # Fall back to one substring scan per keyword
+    ahocorasick = None
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """Serialize to a compact JSON string."""
+    if orjson:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+# Element selectors for the selectolax parser
+RECAPTCHA_DIV_CSS = 'div[class*="recaptcha" i]'
+RECAPTCHA_IFRAME_CSS = 'iframe[src*="recaptcha" i]'
+HCAPTCHA_DIV_CSS = 'div[class*="h-captcha" i]'
+HCAPTCHA_IFRAME_CSS = 'iframe[src*="hcaptcha" i]'
+CF_WRAPPER_CSS = 'div[id="cf-wrapper"]'
+
+# Attribute patterns for the BeautifulSoup fallback
+RECAPTCHA_PATTERN = re.compile(r'recaptcha', re.I)
+H_CAPTCHA_CLASS_PATTERN = re.compile(r'h-captcha', re.I)
+HCAPTCHA_SRC_PATTERN = re.compile(r'hcaptcha', re.I)
+
+if lxml is not None:
+    _REGEX_NS = {'re': 'http://exslt.org/regular-expressions'}
+
+    RECAPTCHA_DIV_XPATH = etree.XPath("//div[re:test(@class, 'recaptcha', 'i')]", namespaces=_REGEX_NS)
+    RECAPTCHA_IFRAME_XPATH = etree.XPath("//iframe[re:test(@src, 'recaptcha', 'i')]", namespaces=_REGEX_NS)
+    HCAPTCHA_DIV_XPATH = etree.XPath("//div[re:test(@class, 'h-captcha', 'i')]", namespaces=_REGEX_NS)
+    HCAPTCHA_IFRAME_XPATH = etree.XPath("//iframe[re:test(@src, 'hcaptcha', 'i')]", namespaces=_REGEX_NS)
+    CF_WRAPPER_XPATH = etree.XPath("//div[@id='cf-wrapper']")
+else:
+    RECAPTCHA_DIV_XPATH = RECAPTCHA_IFRAME_XPATH = None
+    HCAPTCHA_DIV_XPATH = HCAPTCHA_IFRAME_XPATH = None
+    CF_WRAPPER_XPATH = None
+
+
+# Keywords are interned so set lookups on scan results compare by identity
+CUSTOM_CAPTCHA_KEYWORDS = tuple(map(sys.intern, (
+    'verify you are human',
+    'prove you are not a robot',
+    'security check',
+    'are you a robot',
+    'human verification',
+    'please verify',
+    'captcha',
+)))
+
+RATE_LIMIT_KEYWORDS = tuple(map(sys.intern, (
+    'too many requests',
+    'rate limit',
+    'slow down',
+    'try again later',
+    'temporarily blocked',
+    'access denied',
+    '429',
+    '403 forbidden',
+)))
+
+# Keyword-only categories, checked in order:
+# captcha_type -> (keywords, hits needed, keywords decisive on their own, description)
+KEYWORD_CATEGORIES = {
+    "custom": (CUSTOM_CAPTCHA_KEYWORDS, 2, frozenset({'captcha'}), "Custom CAPTCHA/verification detected"),
+    "rate_limit": (RATE_LIMIT_KEYWORDS, 1, frozenset(), "Rate limiting or blocking detected"),
+}
+
+# Every substring the detectors look for, matched case-insensitively
+KEYWORDS = tuple(map(sys.intern, (
+    'recaptcha', 'g-recaptcha', 'google.com/recaptcha',
+    'recaptcha/api.js', 'recaptcha/api2', 'grecaptcha.execute',
+    'hcaptcha', 'h-captcha', 'hcaptcha.com',
+    'checking your browser', 'cloudflare', 'challenge', 'cf-ray', 'cf_clearance',
+))) + CUSTOM_CAPTCHA_KEYWORDS + RATE_LIMIT_KEYWORDS
+
+if ahocorasick is not None:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+else:
+    _KEYWORD_AUTOMATON = None
+
+# Case-insensitive union of all keywords, longest first, as a lookahead so
+# matches may start at every position
+_KEYWORD_PATTERN = re.compile(
+    '(?=(' + '|'.join(map(re.escape, sorted(KEYWORDS, key=len, reverse=True))) + '))',
+    re.IGNORECASE | re.ASCII
+)
+
+# Keywords contained in each keyword; a match on the longer one implies them
+_IMPLIED_KEYWORDS = {kw: frozenset(k for k in KEYWORDS if k in kw) for kw in KEYWORDS}
+
+
+def find_keywords(html_content: str) -> set:
+    """Return the KEYWORDS occurring in html_content, ignoring case, in a single pass."""
+    if _KEYWORD_AUTOMATON is not None:
+        # The automaton is case-sensitive, so it needs a lowercased copy
+        return {keyword for _, keyword in _KEYWORD_AUTOMATON.iter(html_content.lower())}
+
+    found = set()
+    for match in _KEYWORD_PATTERN.finditer(html_content):
+        found |= _IMPLIED_KEYWORDS[match.group(1).lower()]
+    return found
+
+
+def _parse_tree(html_content: str):
+    """Parse HTML into an lxml tree, or None for an empty document."""
+    if not html_content.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html_content)
+    except ValueError:
+        # lxml rejects str input that carries an XML encoding declaration
+        return lxml.html.fromstring(html_content.encode('utf-8'))
+    except etree.ParserError:
+        return None
 
 
 class CaptchaDetector:
@@ -21,10 +170,35 @@ class CaptchaDetector:
             html_content: HTML content to analyze
             url: Current page URL
         """
-        self.html = html_content.lower()
-        self.soup = BeautifulSoup(html_content, 'html.parser')
+        self.raw = html_content
+        self.found = find_keywords(html_content)
+        self.dom = self.tree = self.soup = None
+        if LexborHTMLParser is not None:
+            self.dom = LexborHTMLParser(html_content)
+        elif lxml is not None:
+            self.tree = _parse_tree(html_content)
+        else:
+            self.soup = BeautifulSoup(html_content, 'html.parser')
         self.url = url
 
+    def _has_element(self, css: str, xpath, tag: str, **attrs) -> bool:
+        """
+        Check whether the page contains a matching element.
+
+        Args:
+            css: CSS selector used with the selectolax parser
+            xpath: Precompiled XPath used with the lxml tree
+            tag: Tag name used with the BeautifulSoup fallback
+            **attrs: Attribute filters used with the BeautifulSoup fallback
+        """
+        if self.dom is not None:
+            return self.dom.css_first(css) is not None
+        if self.soup is not None:
+            return bool(self.soup.find(tag, **attrs))
+        if self.tree is None:
+            return False
+        return bool(xpath(self.tree))
+
     def detect(self) -> Tuple[bool, Optional[str], Dict]:
         """
         Detect if page has CAPTCHA or anti-bot measures.
@@ -32,16 +206,17 @@ class CaptchaDetector:
         Returns:
             Tuple of (has_captcha, captcha_type, details)
         """
-        # Check each type
-        detectors = [
-            self._detect_recaptcha(),
-            self._detect_hcaptcha(),
-            self._detect_cloudflare(),
-            self._detect_custom_captcha(),
-            self._detect_rate_limiting(),
-        ]
-
-        for has_captcha, captcha_type, details in detectors:
+        # Check each type, stopping at the first hit
+        detectors = (
+            self._detect_recaptcha,
+            self._detect_hcaptcha,
+            self._detect_cloudflare,
+            *(partial(self._detect_keyword_category, captcha_type)
+              for captcha_type in KEYWORD_CATEGORIES),
+        )
+
+        for detector in detectors:
+            has_captcha, captcha_type, details = detector()
             if has_captcha:
                 return True, captcha_type, details
 
@@ -50,20 +225,20 @@ class CaptchaDetector:
     def _detect_recaptcha(self) -> Tuple[bool, Optional[str], Dict]:
         """Detect Google reCAPTCHA."""
         indicators = [
-            'recaptcha' in self.html,
-            'g-recaptcha' in self.html,
-            'google.com/recaptcha' in self.html,
-            bool(self.soup.find('div', class_=re.compile(r'.*recaptcha.*', re.I))),
-            bool(self.soup.find('iframe', src=re.compile(r'.*recaptcha.*', re.I))),
+            'recaptcha' in self.found,
+            'g-recaptcha' in self.found,
+            'google.com/recaptcha' in self.found,
+            self._has_element(RECAPTCHA_DIV_CSS, RECAPTCHA_DIV_XPATH, 'div', class_=RECAPTCHA_PATTERN),
+            self._has_element(RECAPTCHA_IFRAME_CSS, RECAPTCHA_IFRAME_XPATH, 'iframe', src=RECAPTCHA_PATTERN),
         ]
 
         if any(indicators):
             # Determine version
-            if 'recaptcha/api.js' in self.html:
+            if 'recaptcha/api.js' in self.found:
                 version = "v2"
-            elif 'recaptcha/api2' in self.html:
+            elif 'recaptcha/api2' in self.found:
                 version = "v2"
-            elif 'grecaptcha.execute' in self.html:
+            elif 'grecaptcha.execute' in self.found:
                 version = "v3"
             else:
                 version = "unknown"
@@ -79,11 +254,11 @@ class CaptchaDetector:
     def _detect_hcaptcha(self) -> Tuple[bool, Optional[str], Dict]:
         """Detect hCaptcha."""
         indicators = [
-            'hcaptcha' in self.html,
-            'h-captcha' in self.html,
-            'hcaptcha.com' in self.html,
-            bool(self.soup.find('div', class_=re.compile(r'.*h-captcha.*', re.I))),
-            bool(self.soup.find('iframe', src=re.compile(r'.*hcaptcha.*', re.I))),
+            'hcaptcha' in self.found,
+            'h-captcha' in self.found,
+            'hcaptcha.com' in self.found,
+            self._has_element(HCAPTCHA_DIV_CSS, HCAPTCHA_DIV_XPATH, 'div', class_=H_CAPTCHA_CLASS_PATTERN),
+            self._has_element(HCAPTCHA_IFRAME_CSS, HCAPTCHA_IFRAME_XPATH, 'iframe', src=HCAPTCHA_SRC_PATTERN),
         ]
 
         if any(indicators):
@@ -97,11 +272,11 @@ class CaptchaDetector:
     def _detect_cloudflare(self) -> Tuple[bool, Optional[str], Dict]:
         """Detect Cloudflare challenge page."""
         indicators = [
-            'checking your browser' in self.html,
-            'cloudflare' in self.html and 'challenge' in self.html,
-            'cf-ray' in self.html,
-            'cf_clearance' in self.html,
-            bool(self.soup.find('div', id='cf-wrapper')),
+            'checking your browser' in self.found,
+            'cloudflare' in self.found and 'challenge' in self.found,
+            'cf-ray' in self.found,
+            'cf_clearance' in self.found,
+            self._has_element(CF_WRAPPER_CSS, CF_WRAPPER_XPATH, 'div', id='cf-wrapper'),
         ]
 
         if any(indicators):
@@ -112,55 +287,15 @@ class CaptchaDetector:
 
         return False, None, {}
 
-    def _detect_custom_captcha(self) -> Tuple[bool, Optional[str], Dict]:
-        """Detect custom CAPTCHA implementations."""
-        keywords = [
-            'verify you are human',
-            'prove you are not a robot',
-            'security check',
-            'are you a robot',
-            'human verification',
-            'please verify',
-            'captcha',
-        ]
-
-        found_keywords = []
-        for keyword in keywords:
-            if keyword in self.html:
-                found_keywords.append(keyword)
-
-        if found_keywords:
-            # Check if likely a CAPTCHA page
-            if len(found_keywords) >= 2 or 'captcha' in found_keywords:
-                return True, "custom", {
-                    "keywords": found_keywords,
-                    "description": "Custom CAPTCHA/verification detected"
-                }
-
-        return False, None, {}
-
-    def _detect_rate_limiting(self) -> Tuple[bool, Optional[str], Dict]:
-        """Detect rate limiting or blocking."""
-        keywords = [
-            'too many requests',
-            'rate limit',
-            'slow down',
-            'try again later',
-            'temporarily blocked',
-            'access denied',
-            '429',
-            '403 forbidden',
-        ]
-
-        found_keywords = []
-        for keyword in keywords:
-            if keyword in self.html:
-                found_keywords.append(keyword)
+    def _detect_keyword_category(self, captcha_type: str) -> Tuple[bool, Optional[str], Dict]:
+        """Detect a keyword-only category from KEYWORD_CATEGORIES."""
+        keywords, min_hits, decisive, description = KEYWORD_CATEGORIES[captcha_type]
+        found_keywords = [kw for kw in keywords if kw in self.found]
 
-        if found_keywords:
-            return True, "rate_limit", {
+        if len(found_keywords) >= min_hits or not decisive.isdisjoint(found_keywords):
+            return True, captcha_type, {
                 "keywords": found_keywords,
-                "description": "Rate limiting or blocking detected"
+                "description": description
             }
 
         return False, None, {}
@@ -188,12 +323,11 @@ class CaptchaDetector:
 
 # JSON I/O Interface for Agent Calls
 if __name__ == "__main__":
-    import json
     import sys
 
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = _loads(sys.stdin.buffer.read())
 
         html_content = input_data.get("html", "")
         url = input_data.get("url", "")
@@ -213,7 +347,7 @@ if __name__ == "__main__":
         if has_captcha:
             result["recommendation"] = detector.get_handling_recommendation(captcha_type)
 
-        print(json.dumps(result))
+        print(_dumps(result))
         sys.exit(0)
 
     except Exception as e:
@@ -221,5 +355,5 @@ if __name__ == "__main__":
             "success": False,
             "error": str(e)
         }
-        print(json.dumps(error_result))
+        print(_dumps(error_result))
         sys.exit(1)
@@ -11,28 +11,362 @@ Implements extraction logic for job data from HTML using multiple strategies:
 
 import re
 import json
-from typing import Dict, List, Optional, Any, Tuple
-from bs4 import BeautifulSoup
+from functools import lru_cache, cached_property
+from typing import Dict, List, Optional, Any, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, timedelta
-import html
+from io import BytesIO
+
+# Prefer selectolax's Lexbor parser for the page tree; otherwise BeautifulSoup
+# with the C-backed lxml tree builder, and html.parser as the pure-Python fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    from lxml import etree
+    PARSER = 'lxml'
+except ImportError:
+    etree = None
+    PARSER = 'html.parser'
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # Fall back to one substring scan per alias
+    ahocorasick = None
+
+# Schema sections holding field definitions, in merge order
+FIELD_PRIORITIES = ["required", "high_priority", "medium_priority", "optional", "custom_fields"]
+
+# Salary ranges with currency, as one alternation so the text is scanned once
+SALARY_PATTERN = re.compile(
+    # €60,000 - €80,000 or €60.000 - €80.000 (European format)
+    r'€\s?(?P<eur_min>\d{1,3}(?:[.,]\d{3})*)\s?-\s?€\s?(?P<eur_max>\d{1,3}(?:[.,]\d{3})*)'
+    # $60,000 - $80,000
+    r'|\$\s?(?P<usd_min>\d{1,3}(?:,\d{3})*)\s?-\s?\$\s?(?P<usd_max>\d{1,3}(?:,\d{3})*)'
+    # 60k-80k EUR
+    r'|(?P<code_min>\d{1,3})k?\s?-\s?(?P<code_max>\d{1,3})k?\s?(?P<code>EUR|USD|GBP|CHF)',
+    re.IGNORECASE
+)
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Mailboxes that usually belong to the hiring team
+EMAIL_HIGH_PRIORITY_KEYWORDS = ("jobs@", "careers@", "recruiting@", "hr@", "hiring@")
+EMAIL_HIGH_PRIORITY_PATTERN = re.compile('|'.join(map(re.escape, EMAIL_HIGH_PRIORITY_KEYWORDS)))
+
+PHONE_PATTERNS = [
+    re.compile(r'\+\d{1,3}\s?\(?\d{1,4}\)?\s?\d{1,4}\s?\d{1,4}\s?\d{1,9}'),  # International
+    re.compile(r'\(\d{3}\)\s?\d{3}-\d{4}'),  # US format
+    re.compile(r'\d{2,4}\s?\d{2,4}\s?\d{2,4}\s?\d{2,4}'),  # European
+]
+
+# Relative dates with their unit
+RELATIVE_DATE_PATTERNS = [
+    (re.compile(r'(\d+)\s+days?\s+ago', re.IGNORECASE), 'days'),
+    (re.compile(r'(\d+)\s+weeks?\s+ago', re.IGNORECASE), 'weeks'),
+    (re.compile(r'(\d+)\s+months?\s+ago', re.IGNORECASE), 'months'),
+    (re.compile(r'yesterday', re.IGNORECASE), 'yesterday'),
+]
+
+ABSOLUTE_DATE_PATTERNS = [
+    re.compile(r'\d{4}-\d{2}-\d{2}'),  # ISO format
+    re.compile(r'\d{1,2}/\d{1,2}/\d{4}'),  # US format
+    re.compile(r'\d{1,2}\.\d{1,2}\.\d{4}'),  # European format
+]
+
+# Characters that make an alias a regex rather than a literal phrase
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+# Tags that label a nearby value, in lookup order
+LABEL_TAGS = ('label', 'dt', 'strong', 'b')
+
+# Section headings that introduce long-form fields
+SECTION_MAPPING = {
+    "description": ("about the role", "job description", "position overview", "what you'll do"),
+    "requirements": ("requirements", "qualifications", "what we're looking for", "you have"),
+    "responsibilities": ("responsibilities", "your tasks", "day-to-day", "duties"),
+    "benefits": ("benefits", "what we offer", "perks", "why join us"),
+    "companyDescription": ("about us", "about the company", "who we are", "our story"),
+}
+SECTION_PATTERNS = {
+    field: re.compile('|'.join(re.escape(header) for header in headers))
+    for field, headers in SECTION_MAPPING.items()
+}
+
+# Restricts a BeautifulSoup parse to the JSON-LD blocks
+JSONLD_STRAINER = SoupStrainer('script', attrs={'type': 'application/ld+json'})
+
+# Tags that can head a section, in lookup order
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'strong')
+
+# Tags that end a section's content, and list containers inside it
+SECTION_STOP_TAGS = frozenset({'h1', 'h2', 'h3', 'h4'})
+LIST_TAGS = frozenset({'ul', 'ol'})
+
+
+
+class _KeepCharsTable(dict):
+    """
+    str.translate() table deleting everything but decimal digits and `keep`.
+    Entries are filled on first sight, so any Unicode digit is kept like \\d.
+    """
+
+    def __init__(self, keep: str = ''):
+        super().__init__()
+        self.keep = keep
+
+    def __missing__(self, code: int) -> Optional[int]:
+        char = chr(code)
+        value = code if char.isdecimal() or char in self.keep else None
+        self[code] = value
+        return value
+
+
+DIGITS_ONLY = _KeepCharsTable()
+NUMBER_CHARS_ONLY = _KeepCharsTable('.')
+
+
+@lru_cache(maxsize=1024)
+def _parse_jsonld(script_text: str) -> Any:
+    """
+    Parse a JSON-LD block, memoized because job boards repeat identical blocks
+    across postings. Callers must not mutate the returned data.
+    """
+    # orjson rejects str subclasses such as bs4's NavigableString
+    return _loads(str(script_text))
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+@lru_cache(maxsize=512)
+def _alias_pattern(alias: str) -> re.Pattern:
+    """Compile the generic "<alias>: value" pattern for one alias."""
+    try:
+        return re.compile(rf"{alias}\s*[:\-]?\s*([^\n\r]+)", re.IGNORECASE)
+    except re.error:
+        # Alias is not a valid regex; match it literally
+        return re.compile(rf"{re.escape(alias)}\s*[:\-]?\s*([^\n\r]+)", re.IGNORECASE)
+
+
+def _alias_literal(alias: str) -> Optional[str]:
+    """Lowercased alias if it is a plain phrase whose absence rules out a match, else None."""
+    if REGEX_METACHARACTERS.intersection(alias):
+        return None
+    return alias.lower()
+
+
+class _LexborNode:
+    """BeautifulSoup-style view of a selectolax node, limited to what the strategies use."""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self) -> str:
+        return self.node.tag
+
+    @property
+    def parent(self) -> Optional["_LexborNode"]:
+        parent = self.node.parent
+        return _LexborNode(parent) if parent is not None else None
+
+    @property
+    def string(self) -> Optional[str]:
+        return self.node.text(deep=True) or None
+
+    def get_text(self) -> str:
+        return self.node.text(deep=True)
+
+    def find_all(self, tags: Union[str, Tuple[str, ...]], **attrs: str) -> List["_LexborNode"]:
+        if isinstance(tags, str):
+            tags = (tags,)
+        attr_css = ''.join(f'[{key}="{value}"]' for key, value in attrs.items())
+        selector = ', '.join(tag + attr_css for tag in tags)
+        return [_LexborNode(node) for node in self.node.css(selector)]
+
+    def find_next_sibling(self) -> Optional["_LexborNode"]:
+        # Skip text and comment nodes, whose tags start with '-'
+        node = self.node.next
+        while node is not None and node.tag.startswith('-'):
+            node = node.next
+        return _LexborNode(node) if node is not None else None
+
+
+class _LexborDocument(_LexborNode):
+    """Root of a Lexbor tree, with BeautifulSoup's whole-document get_text()."""
+
+    __slots__ = ('parser',)
+
+    def __init__(self, html_content: str):
+        self.parser = LexborHTMLParser(html_content)
+        super().__init__(self.parser.root)
+
+    def get_text(self) -> str:
+        # BeautifulSoup leaves script and style contents out of the page text
+        text_tree = self.parser.clone()
+        text_tree.strip_tags(['script', 'style'])
+        return text_tree.root.text(deep=True) if text_tree.root else ''
+
+
+class CompiledSchema:
+    """Extraction schema prepared once and reused across many pages."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Merge field definitions and pre-compile per-alias patterns.
+
+        Args:
+            schema: Extraction schema defining fields to extract
+        """
+        self.schema = schema
+
+        self.required_fields = frozenset(schema.get("extraction_schema", {}).get("required", {}))
+
+        self.fields = {}
+        for priority in FIELD_PRIORITIES:
+            if priority in schema.get("extraction_schema", {}):
+                self.fields.update(schema["extraction_schema"][priority])
+
+        # (literal, pattern) per alias; a literal lets pages skip the regex
+        # search when the phrase does not occur at all
+        self.alias_patterns = {
+            field_name: [(_alias_literal(alias), _alias_pattern(alias))
+                         for alias in field_config.get('aliases', [field_name])]
+            for field_name, field_config in self.fields.items()
+        }
+
+        literals = {literal for patterns in self.alias_patterns.values()
+                    for literal, _ in patterns if literal}
+        if ahocorasick is not None and literals:
+            self.alias_automaton = ahocorasick.Automaton()
+            for literal in literals:
+                self.alias_automaton.add_word(literal, literal)
+            self.alias_automaton.make_automaton()
+        else:
+            self.alias_automaton = None
+
+        # Fields not worth a DOM/regex scan once the page has JSON-LD
+        self.skip_if_structured = frozenset(
+            field_name for field_name, field_config in self.fields.items()
+            if field_config.get('skip_if_structured')
+        )
+
+    def extract(self, html_content: str) -> Dict[str, Any]:
+        """
+        Extract all schema fields from one page.
+
+        Args:
+            html_content: HTML content to parse
+
+        Returns:
+            Dictionary of extracted job data
+        """
+        return HTMLExtractor(html_content, self).extract_all()
 
 
 class HTMLExtractor:
     """Extract structured job data from HTML."""
 
-    def __init__(self, html_content: str, schema: Dict[str, Any]):
+    def __init__(self, html_content: str, schema: Union[Dict[str, Any], CompiledSchema]):
         """
         Initialize HTML extractor.
 
         Args:
             html_content: HTML content to parse
-            schema: Extraction schema defining fields to extract
+            schema: Extraction schema defining fields to extract, raw or
+                    pre-compiled with HTMLExtractor.compile()
         """
+        if not isinstance(schema, CompiledSchema):
+            schema = CompiledSchema(schema)
+
         self.html = html_content
-        self.soup = BeautifulSoup(html_content, 'html.parser')
-        self.schema = schema
+        self.compiled = schema
+        self.schema = schema.schema
         self.extracted_data = {}
 
+    @staticmethod
+    def compile(schema: Dict[str, Any]) -> CompiledSchema:
+        """
+        Compile a schema once for extraction from many pages.
+
+        Args:
+            schema: Extraction schema defining fields to extract
+
+        Returns:
+            CompiledSchema whose extract(html) parses one page
+        """
+        return CompiledSchema(schema)
+
+    @cached_property
+    def soup(self) -> Union[BeautifulSoup, _LexborDocument]:
+        """Full parse tree, built only once a DOM-based strategy needs it."""
+        if LexborHTMLParser is not None:
+            return _LexborDocument(self.html)
+        return BeautifulSoup(self.html, PARSER)
+
+    @cached_property
+    def full_text(self) -> str:
+        """Page text, extracted once and shared by all pattern strategies."""
+        return self.soup.get_text()
+
+    @cached_property
+    def full_text_lower(self) -> str:
+        """Lowercased page text for case-insensitive phrase checks."""
+        return self.full_text.lower()
+
+    @cached_property
+    def present_aliases(self) -> Optional[frozenset]:
+        """Literal aliases occurring in the page text, from one automaton pass."""
+        if self.compiled.alias_automaton is None:
+            return None
+        return frozenset(literal for _, literal in
+                         self.compiled.alias_automaton.iter(self.full_text_lower))
+
+    def _alias_present(self, literal: Optional[str]) -> bool:
+        """Whether an alias can match at all; regex aliases always might."""
+        if literal is None:
+            return True
+        if self.present_aliases is not None:
+            return literal in self.present_aliases
+        return literal in self.full_text_lower
+
+    @cached_property
+    def label_index(self) -> Dict[str, List[Tuple[str, Any]]]:
+        """Lowercased text and element of every label-like tag, by tag, from one tree pass."""
+        index = {tag: [] for tag in LABEL_TAGS}
+        for elem in self.soup.find_all(LABEL_TAGS):
+            index[elem.name].append((elem.get_text().lower(), elem))
+        return index
+
+    @cached_property
+    def heading_index(self) -> List[Tuple[str, Any]]:
+        """Lowercased text and element of every heading, in tag then document order."""
+        by_tag = {tag: [] for tag in HEADING_TAGS}
+        for elem in self.soup.find_all(HEADING_TAGS):
+            by_tag[elem.name].append((elem.get_text().lower(), elem))
+        return [entry for tag in HEADING_TAGS for entry in by_tag[tag]]
+
     def extract_all(self) -> Dict[str, Any]:
         """
         Extract all fields defined in schema.
@@ -57,16 +391,15 @@ class HTMLExtractor:
             result["job"].update(structured_data)
 
         # Count all fields across priorities
-        all_fields = {}
-        for priority in ["required", "high_priority", "medium_priority", "optional", "custom_fields"]:
-            if priority in self.schema.get("extraction_schema", {}):
-                all_fields.update(self.schema["extraction_schema"][priority])
+        all_fields = self.compiled.fields
 
         result["extraction"]["fieldsRequested"] = len(all_fields)
 
         # Extract each field
         total_confidence = 0
         for field_name, field_config in all_fields.items():
+            if structured_data and field_name in self.compiled.skip_if_structured:
+                continue
             if field_name not in result["job"]:
                 extracted = self._extract_field(field_name, field_config)
                 if extracted and extracted.get("found"):
@@ -98,9 +431,9 @@ class HTMLExtractor:
         result = {}
 
         # Try JSON-LD
-        for script in self.soup.find_all('script', type='application/ld+json'):
+        for script_text in self._jsonld_scripts():
             try:
-                data = json.loads(script.string)
+                data = _parse_jsonld(script_text)
 
                 # Handle JobPosting schema
                 if isinstance(data, dict) and data.get('@type') == 'JobPosting':
@@ -115,8 +448,45 @@ class HTMLExtractor:
             except (json.JSONDecodeError, AttributeError):
                 continue
 
+            # Later blocks are usually Organization/BreadcrumbList; stop once
+            # a JobPosting has filled every required field
+            if result and self.compiled.required_fields <= result.keys():
+                break
+
         return result
 
+    def _jsonld_scripts(self) -> List[Optional[str]]:
+        """
+        Collect the text of every JSON-LD script.
+
+        Until the full tree is built, only <script> elements are streamed out
+        of the page with lxml (or strained out by BeautifulSoup without it),
+        so pages fully covered by structured data never pay for a full tree.
+
+        Returns:
+            Script contents in document order (None for empty scripts)
+        """
+        if 'soup' in self.__dict__:
+            document = self.soup
+        else:
+            if etree is not None:
+                scripts = []
+                try:
+                    for _, elem in etree.iterparse(BytesIO(self.html.encode('utf-8')),
+                                                   events=('end',), tag='script',
+                                                   html=True, encoding='utf-8'):
+                        if elem.get('type') == 'application/ld+json':
+                            scripts.append(elem.text)
+                        elem.clear(keep_tail=True)
+                    return scripts
+                except etree.XMLSyntaxError:
+                    pass  # e.g. a page with no elements; let BeautifulSoup handle it
+
+            document = BeautifulSoup(self.html, PARSER, parse_only=JSONLD_STRAINER)
+
+        return [script.string for script in
+                document.find_all('script', type='application/ld+json')]
+
     def _parse_job_posting_schema(self, data: Dict) -> Dict[str, Any]:
         """Parse Schema.org JobPosting data."""
         result = {}
@@ -243,19 +613,11 @@ class HTMLExtractor:
         """Extract field from labeled HTML elements."""
         # Search for labels matching aliases
         for alias in aliases:
-            # Check various label patterns
-            patterns = [
-                (By.TAG_NAME, "label", alias),
-                (By.CLASS_NAME, "label", alias),
-                (By.TAG_NAME, "dt", alias),  # Definition term
-                (By.TAG_NAME, "strong", alias),
-                (By.TAG_NAME, "b", alias),
-            ]
-
-            for by, tag, text in patterns:
-                elements = self.soup.find_all(tag)
-                for elem in elements:
-                    if alias.lower() in elem.get_text().lower():
+            alias_lower = alias.lower()
+
+            for tag in LABEL_TAGS:
+                for text, elem in self.label_index[tag]:
+                    if alias_lower in text:
                         # Found label, get next sibling or parent content
                         value = self._extract_value_near_element(elem, field_type)
                         if value:
@@ -271,7 +633,7 @@ class HTMLExtractor:
     def _extract_by_pattern(self, field_name: str, field_type: str,
                             aliases: List[str], config: Dict) -> Optional[Dict]:
         """Extract field using regex patterns."""
-        text = self.soup.get_text()
+        text = self.full_text
 
         # Field-specific pattern extraction
         if field_name == "salary" or field_type == "object" and "salary" in field_name.lower():
@@ -288,9 +650,14 @@ class HTMLExtractor:
 
         elif field_type == "string":
             # Generic string extraction
-            for alias in aliases:
-                pattern = rf"{alias}\s*[:\-]?\s*([^\n\r]+)"
-                match = re.search(pattern, text, re.IGNORECASE)
+            patterns = self.compiled.alias_patterns.get(field_name)
+            if patterns is None:
+                patterns = [(_alias_literal(alias), _alias_pattern(alias)) for alias in aliases]
+
+            for literal, pattern in patterns:
+                if not self._alias_present(literal):
+                    continue
+                match = pattern.search(text)
                 if match:
                     value = match.group(1).strip()
                     if len(value) > 3:  # Minimum length
@@ -305,87 +672,80 @@ class HTMLExtractor:
 
     def _extract_salary(self, text: str) -> Optional[Dict]:
         """Extract salary with currency and range."""
-        # Various salary patterns
-        patterns = [
-            # €60,000 - €80,000
-            r'€\s?(\d{1,3}(?:[.,]\d{3})*)\s?-\s?€\s?(\d{1,3}(?:[.,]\d{3})*)',
-            # $60,000 - $80,000
-            r'\$\s?(\d{1,3}(?:,\d{3})*)\s?-\s?\$\s?(\d{1,3}(?:,\d{3})*)',
-            # 60k-80k EUR
-            r'(\d{1,3})k?\s?-\s?(\d{1,3})k?\s?(EUR|USD|GBP|CHF)',
-            # €60.000 - €80.000 (European format)
-            r'€\s?(\d{1,3}(?:\.\d{3})*)\s?-\s?€\s?(\d{1,3}(?:\.\d{3})*)',
-        ]
+        match = SALARY_PATTERN.search(text)
+        if not match:
+            return None
 
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-
-                # Parse amounts
-                min_amount = self._parse_number(groups[0])
-                max_amount = self._parse_number(groups[1])
-
-                # Detect currency
-                currency = "EUR"
-                if '$' in match.group(0):
-                    currency = "USD"
-                elif '£' in match.group(0):
-                    currency = "GBP"
-                elif len(groups) > 2:
-                    currency = groups[2].upper()
-
-                # Handle 'k' notation
-                if 'k' in match.group(0).lower():
-                    min_amount *= 1000
-                    max_amount *= 1000
+        # Parse amounts and currency from whichever alternative matched
+        if match.group('eur_min'):
+            min_amount = self._parse_number(match.group('eur_min'))
+            max_amount = self._parse_number(match.group('eur_max'))
+            currency = "EUR"
+        elif match.group('usd_min'):
+            min_amount = self._parse_number(match.group('usd_min'))
+            max_amount = self._parse_number(match.group('usd_max'))
+            currency = "USD"
+        else:
+            min_amount = self._parse_number(match.group('code_min'))
+            max_amount = self._parse_number(match.group('code_max'))
+            currency = match.group('code').upper()
 
-                return {
-                    "min": int(min_amount),
-                    "max": int(max_amount),
-                    "currency": currency,
-                    "period": "annual",
-                    "displayText": match.group(0).strip(),
-                    "confidence": 75,
-                    "source": "pattern",
-                    "found": True
-                }
+        # Handle 'k' notation
+        if 'k' in match.group(0).lower():
+            min_amount *= 1000
+            max_amount *= 1000
 
-        return None
+        return {
+            "min": int(min_amount),
+            "max": int(max_amount),
+            "currency": currency,
+            "period": "annual",
+            "displayText": match.group(0).strip(),
+            "confidence": 75,
+            "source": "pattern",
+            "found": True
+        }
 
     def _extract_email(self, text: str) -> Optional[Dict]:
         """Extract email with priority filtering."""
-        pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(pattern, text)
+        first_email = None
+        first_company_email = None
+
+        # Classify while scanning: a hiring mailbox wins outright, otherwise
+        # the first non-noreply address is a generic company email
+        for match in EMAIL_PATTERN.finditer(text):
+            email = match.group()
+            email_lower = email.lower()
+            if first_email is None:
+                first_email = email
+            if "noreply" in email_lower:  # Exclude noreply
+                continue
+            if EMAIL_HIGH_PRIORITY_PATTERN.search(email_lower):
+                return {
+                    "value": email,
+                    "priority": "high",
+                    "confidence": 90,
+                    "source": "pattern",
+                    "found": True
+                }
+            if first_company_email is None:
+                first_company_email = email
 
-        if not emails:
+        if first_email is None:
             return None
 
-        # Priority filtering
-        priorities = {
-            "high": ["jobs@", "careers@", "recruiting@", "hr@", "hiring@"],
-            "medium": ["@"],  # Any company email
-            "low": ["info@", "contact@", "noreply@"]
-        }
-
-        # Filter by priority
-        for priority, keywords in priorities.items():
-            for email in emails:
-                email_lower = email.lower()
-                if any(kw in email_lower for kw in keywords):
-                    if "noreply" not in email_lower:  # Exclude noreply
-                        confidence = 90 if priority == "high" else 75 if priority == "medium" else 60
-                        return {
-                            "value": email,
-                            "priority": priority,
-                            "confidence": confidence,
-                            "source": "pattern",
-                            "found": True
-                        }
+        if first_company_email is not None:
+            return {
+                "value": first_company_email,
+                "priority": "medium",
+                "confidence": 75,
+                "source": "pattern",
+                "found": True
+            }
 
         # Return first email if no priority match
         return {
-            "value": emails[0],
+            "value": first_email,
             "priority": "unknown",
             "confidence": 55,
             "source": "pattern",
@@ -394,18 +754,12 @@ class HTMLExtractor:
 
     def _extract_phone(self, text: str) -> Optional[Dict]:
         """Extract phone number."""
-        patterns = [
-            r'\+\d{1,3}\s?\(?\d{1,4}\)?\s?\d{1,4}\s?\d{1,4}\s?\d{1,9}',  # International
-            r'\(\d{3}\)\s?\d{3}-\d{4}',  # US format
-            r'\d{2,4}\s?\d{2,4}\s?\d{2,4}\s?\d{2,4}',  # European
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in PHONE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 phone = match.group(0).strip()
                 # Validate length (7-15 digits)
-                digits = re.sub(r'\D', '', phone)
+                digits = phone.translate(DIGITS_ONLY)
                 if 7 <= len(digits) <= 15:
                     return {
                         "value": phone,
@@ -419,15 +773,8 @@ class HTMLExtractor:
     def _extract_date(self, text: str) -> Optional[Dict]:
         """Extract and normalize date."""
         # Relative dates
-        relative_patterns = [
-            (r'(\d+)\s+days?\s+ago', 'days'),
-            (r'(\d+)\s+weeks?\s+ago', 'weeks'),
-            (r'(\d+)\s+months?\s+ago', 'months'),
-            (r'yesterday', 'yesterday'),
-        ]
-
-        for pattern, unit in relative_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern, unit in RELATIVE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 if unit == 'yesterday':
                     date = datetime.now() - timedelta(days=1)
@@ -449,14 +796,8 @@ class HTMLExtractor:
                 }
 
         # Absolute dates
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # ISO format
-            r'\d{1,2}/\d{1,2}/\d{4}',  # US format
-            r'\d{1,2}\.\d{1,2}\.\d{4}',  # European format
-        ]
-
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
+        for pattern in ABSOLUTE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return {
                     "value": match.group(0),
@@ -470,36 +811,29 @@ class HTMLExtractor:
     def _extract_from_section(self, field_name: str, field_type: str,
                                aliases: List[str], config: Dict) -> Optional[Dict]:
         """Extract field from content sections."""
-        # Section headers mapping
-        section_mapping = {
-            "description": ["about the role", "job description", "position overview", "what you'll do"],
-            "requirements": ["requirements", "qualifications", "what we're looking for", "you have"],
-            "responsibilities": ["responsibilities", "your tasks", "day-to-day", "duties"],
-            "benefits": ["benefits", "what we offer", "perks", "why join us"],
-            "companyDescription": ["about us", "about the company", "who we are", "our story"],
-        }
-
-        if field_name not in section_mapping:
+        if field_name not in SECTION_MAPPING:
             return None
 
-        headers = section_mapping[field_name]
+        # Keep only headings that mention any section header, in one pass
+        pattern = SECTION_PATTERNS[field_name]
+        candidates = [(text, elem) for text, elem in self.heading_index if pattern.search(text)]
+        if not candidates:
+            return None
 
         # Find section
-        for header in headers:
+        for header in SECTION_MAPPING[field_name]:
             # Look for headings containing this text
-            for heading_tag in ['h1', 'h2', 'h3', 'h4', 'strong']:
-                headings = self.soup.find_all(heading_tag)
-                for heading in headings:
-                    if header in heading.get_text().lower():
-                        # Extract content after this heading
-                        content = self._extract_content_after_heading(heading, field_type)
-                        if content:
-                            return {
-                                "value": content,
-                                "confidence": 65,
-                                "source": "section",
-                                "found": True
-                            }
+            for text, heading in candidates:
+                if header in text:
+                    # Extract content after this heading
+                    content = self._extract_content_after_heading(heading, field_type)
+                    if content:
+                        return {
+                            "value": content,
+                            "confidence": 65,
+                            "source": "section",
+                            "found": True
+                        }
 
         return None
 
@@ -510,8 +844,8 @@ class HTMLExtractor:
             items = []
             next_elem = heading_elem.find_next_sibling()
 
-            while next_elem and next_elem.name not in ['h1', 'h2', 'h3', 'h4']:
-                if next_elem.name in ['ul', 'ol']:
+            while next_elem and next_elem.name not in SECTION_STOP_TAGS:
+                if next_elem.name in LIST_TAGS:
                     for li in next_elem.find_all('li'):
                         text = li.get_text().strip()
                         if text:
@@ -526,7 +860,7 @@ class HTMLExtractor:
             text_parts = []
             next_elem = heading_elem.find_next_sibling()
 
-            while next_elem and next_elem.name not in ['h1', 'h2', 'h3', 'h4']:
+            while next_elem and next_elem.name not in SECTION_STOP_TAGS:
                 if next_elem.name == 'p':
                     text = next_elem.get_text().strip()
                     if text:
@@ -560,7 +894,7 @@ class HTMLExtractor:
     def _parse_number(num_str: str) -> float:
         """Parse number from string with various formats."""
         # Remove non-digit characters except decimal point
-        cleaned = re.sub(r'[^\d.]', '', num_str)
+        cleaned = num_str.translate(NUMBER_CHARS_ONLY)
         try:
             return float(cleaned)
         except ValueError:
@@ -569,12 +903,11 @@ class HTMLExtractor:
 
 # JSON I/O Interface for Agent Calls
 if __name__ == "__main__":
-    import json
     import sys
 
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = _loads(sys.stdin.buffer.read())
 
         html_content = input_data.get("html")
         schema = input_data.get("schema")
@@ -584,7 +917,7 @@ if __name__ == "__main__":
                 "success": False,
                 "error": "Missing required fields: 'html' and 'schema'"
             }
-            print(json.dumps(result))
+            sys.stdout.buffer.write(_dumps(result) + b'\n')
             sys.exit(1)
 
         # Extract data
@@ -597,7 +930,7 @@ if __name__ == "__main__":
             "data": extraction_result
         }
 
-        print(json.dumps(result))
+        sys.stdout.buffer.write(_dumps(result) + b'\n')
         sys.exit(0)
 
     except Exception as e:
@@ -606,5 +939,5 @@ if __name__ == "__main__":
             "success": False,
             "error": str(e)
         }
-        print(json.dumps(error_result))
+        sys.stdout.buffer.write(_dumps(error_result) + b'\n')
         sys.exit(1)
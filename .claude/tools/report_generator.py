@@ -6,24 +6,121 @@ Generates quality analysis reports from scraping session data.
 """
 
 import json
-from typing import Dict, List
+import os
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+LOAD_WORKERS = 16  # Threads reading job files
+
+# JSON files in a jobs directory that aggregate jobs rather than hold one
+AGGREGATE_FILES = frozenset({"jobs.json"})
+
+# Minimum score for each grade above F, ascending, and the grades they map to
+GRADE_THRESHOLDS = (50, 60, 75, 90)
+GRADES = ("F", "D", "C", "B", "A")
+
+# Markdown report layout; each *_rows / recommendations block is a run of
+# newline-terminated entries rendered from the templates below
+REPORT_TEMPLATE = """\
+# Scraping Session Quality Report
+
+**Generated**: {generated}
+**Session**: {session}
+
+## Executive Summary
+
+- **Total Jobs**: {total_jobs}
+- **Average Completeness**: {avg_completeness}%
+- **Average Confidence**: {avg_confidence}%
+- **Overall Grade**: {overall_grade}
+
+## Field Coverage
+
+| Field | Found | Coverage | Avg Confidence | Quality |
+|-------|-------|----------|----------------|---------|
+{field_rows}
+## Quality Distribution
+
+{distribution_rows}
+## Extraction Sources
+
+{source_rows}
+## Recommendations
+{recommendations}"""
+
+FIELD_ROW_TEMPLATE = "| {field} | {found}/{total} | {coverage}% | {confidence}% | {grade} |\n"
+DISTRIBUTION_ROW_TEMPLATE = "- **{grade} Grade**: {count} jobs ({pct}%) {bar}\n"
+SOURCE_ROW_TEMPLATE = "- **{source}**: {count} ({pct}%)\n"
+RECOMMENDATION_TEMPLATE = """
+### {index}. {title}
+
+**Issue**: {issue}
+**Impact**: {impact}
+**Solution**: {solution}
+**Expected Improvement**: {improvement}
+"""
+
+MAX_RECOMMENDATIONS = 5
+
+# Keys of a job record that are bookkeeping, not extracted fields
+NON_FIELD_KEYS = frozenset({"extraction", "metadata"})
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """Serialize to a compact JSON string."""
+    if orjson:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+def _grade_index(completeness: float, confidence: float) -> int:
+    """Index into GRADES for a completeness/confidence pair."""
+    score = (completeness * 0.6) + (confidence * 0.4)
+    return bisect_right(GRADE_THRESHOLDS, score)
+
+
+def _load_job_file(job_file: Path) -> Dict:
+    """Read and parse one job JSON file."""
+    return _loads(job_file.read_bytes())
+
 
 class ReportGenerator:
     """Generate markdown quality reports."""
 
-    def __init__(self, session_dir: str):
+    def __init__(self, session_dir: str, tracked_fields: Optional[Iterable[str]] = None):
         """
         Initialize report generator.
 
         Args:
             session_dir: Path to session directory
+            tracked_fields: Field names to report on, e.g. the schema's
+                            SchemaProcessor.all_fields; None reports every
+                            field found in the job files
         """
         self.session_dir = Path(session_dir)
+        self.tracked_fields = None
+        if tracked_fields is not None:
+            self.tracked_fields = tuple(field_name for field_name in tracked_fields
+                                        if field_name not in NON_FIELD_KEYS)
         self.jobs_data = []
         self.stats = {}
+        self.sorted_fields = []  # Field names in report order, set with stats
 
     def load_session_data(self) -> bool:
         """
@@ -39,14 +136,14 @@ class ReportGenerator:
                 print(f"❌ Jobs directory not found: {jobs_dir}")
                 return False
 
-            # Load all job JSON files
-            for job_file in jobs_dir.glob("*.json"):
-                if job_file.name == "jobs.json":  # Skip aggregate file
-                    continue
+            # Load all job JSON files, skipping aggregate files
+            job_files = [job_file for job_file in jobs_dir.glob("*.json")
+                         if job_file.name not in AGGREGATE_FILES]
 
-                with open(job_file, 'r') as f:
-                    job_data = json.load(f)
-                    self.jobs_data.append(job_data)
+            # Overlap the file reads; results keep the glob order
+            if job_files:
+                with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(job_files))) as executor:
+                    self.jobs_data.extend(executor.map(_load_job_file, job_files))
 
             return len(self.jobs_data) > 0
 
@@ -64,23 +161,29 @@ class ReportGenerator:
         if not self.jobs_data:
             return {}
 
-        stats = {
-            "total_jobs": len(self.jobs_data),
-            "field_coverage": {},
-            "field_confidence": {},
-            "quality_distribution": {"A": 0, "B": 0, "C": 0, "D": 0, "F": 0},
-            "extraction_sources": {"structured": 0, "labeled": 0, "pattern": 0, "section": 0, "inferred": 0},
-            "avg_completeness": 0,
-            "avg_confidence": 0,
-        }
+        self.calculate_core_stats()
+        self.calculate_field_stats()
+        return self.stats
+
+    def calculate_core_stats(self) -> Dict:
+        """
+        Calculate job-level totals, averages and grade distribution.
+
+        Cheap compared to calculate_field_stats(), which only the per-field
+        report tables need.
+
+        Returns:
+            Statistics dictionary (also stored in self.stats)
+        """
+        if not self.jobs_data:
+            return {}
 
         total_completeness = 0
         total_confidence = 0
+        grade_counts = [0] * len(GRADES)  # Indexed like GRADES
 
-        # Analyze each job
         for job_data in self.jobs_data:
-            job = job_data.get("job", {})
-            extraction = job.get("extraction", {})
+            extraction = job_data.get("job", {}).get("extraction", {})
 
             # Completeness
             completeness = extraction.get("dataCompleteness", 0)
@@ -91,52 +194,89 @@ class ReportGenerator:
             total_confidence += avg_conf
 
             # Quality grade
-            grade = self._calculate_grade(completeness, avg_conf)
-            stats["quality_distribution"][grade] += 1
+            grade_counts[_grade_index(completeness, avg_conf)] += 1
+
+        self.stats = {
+            "total_jobs": len(self.jobs_data),
+            # Best grade first, as in the report
+            "quality_distribution": {
+                grade: grade_counts[index] for index, grade in reversed(list(enumerate(GRADES)))
+            },
+            "avg_completeness": int(total_completeness / len(self.jobs_data)),
+            "avg_confidence": int(total_confidence / len(self.jobs_data)),
+        }
+        return self.stats
+
+    def calculate_field_stats(self) -> Dict:
+        """
+        Calculate per-field coverage, confidence and extraction sources.
+
+        Returns:
+            Statistics dictionary (merged into self.stats)
+        """
+        field_coverage = {}
+        extraction_sources = {"structured": 0, "labeled": 0, "pattern": 0, "section": 0, "inferred": 0}
+
+        # Running totals instead of per-field lists of confidences:
+        # field -> [confidence sum, confidence count]
+        confidence_totals = {}
+        source_hits = []  # Tallied once after the loop
+        tracked_fields = self.tracked_fields
+
+        for job_data in self.jobs_data:
+            job = job_data.get("job", {})
+
+            # Field analysis, limited to the tracked fields when given
+            if tracked_fields is None:
+                field_items = job.items()
+            else:
+                field_items = [(field_name, job[field_name]) for field_name in tracked_fields
+                               if field_name in job]
 
-            # Field analysis
-            for field_name, field_value in job.items():
-                if field_name in ["extraction", "metadata"]:
+            for field_name, field_value in field_items:
+                if field_name in NON_FIELD_KEYS:
                     continue
 
                 # Initialize field stats
-                if field_name not in stats["field_coverage"]:
-                    stats["field_coverage"][field_name] = {"found": 0, "total": 0}
-                    stats["field_confidence"][field_name] = []
+                coverage = field_coverage.get(field_name)
+                if coverage is None:
+                    coverage = field_coverage[field_name] = {"found": 0, "total": 0}
+                    confidence_totals[field_name] = [0, 0]
 
-                stats["field_coverage"][field_name]["total"] += 1
+                coverage["total"] += 1
 
                 # Check if field found
-                if isinstance(field_value, dict):
+                if type(field_value) is dict:
                     if field_value.get("found", True):
-                        stats["field_coverage"][field_name]["found"] += 1
+                        coverage["found"] += 1
 
                         # Confidence
                         conf = field_value.get("confidence", 0)
                         if conf > 0:
-                            stats["field_confidence"][field_name].append(conf)
+                            totals = confidence_totals[field_name]
+                            totals[0] += conf
+                            totals[1] += 1
 
                         # Source
-                        source = field_value.get("source", "unknown")
-                        if source in stats["extraction_sources"]:
-                            stats["extraction_sources"][source] += 1
+                        source_hits.append(field_value.get("source", "unknown"))
 
                 elif field_value is not None:
-                    stats["field_coverage"][field_name]["found"] += 1
+                    coverage["found"] += 1
 
-        # Calculate averages
-        stats["avg_completeness"] = int(total_completeness / len(self.jobs_data))
-        stats["avg_confidence"] = int(total_confidence / len(self.jobs_data))
+        # Count known sources only
+        for source, count in Counter(source_hits).items():
+            if source in extraction_sources:
+                extraction_sources[source] += count
 
+        self.stats["field_coverage"] = field_coverage
         # Field-level averages
-        for field_name, confidences in stats["field_confidence"].items():
-            if confidences:
-                stats["field_confidence"][field_name] = int(sum(confidences) / len(confidences))
-            else:
-                stats["field_confidence"][field_name] = 0
-
-        self.stats = stats
-        return stats
+        self.stats["field_confidence"] = {
+            field_name: int(conf_sum / conf_count) if conf_count else 0
+            for field_name, (conf_sum, conf_count) in confidence_totals.items()
+        }
+        self.stats["extraction_sources"] = extraction_sources
+        self.sorted_fields = sorted(field_coverage)
+        return self.stats
 
     def generate_markdown_report(self, output_path: str) -> bool:
         """
@@ -148,89 +288,57 @@ class ReportGenerator:
         Returns:
             True if generated successfully
         """
-        if not self.stats:
+        if "field_coverage" not in self.stats:
             self.calculate_statistics()
 
         try:
-            report_lines = []
-
-            # Header
-            report_lines.append("# Scraping Session Quality Report")
-            report_lines.append("")
-            report_lines.append(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            report_lines.append(f"**Session**: {self.session_dir.name}")
-            report_lines.append("")
-
-            # Executive Summary
-            report_lines.append("## Executive Summary")
-            report_lines.append("")
-            report_lines.append(f"- **Total Jobs**: {self.stats['total_jobs']}")
-            report_lines.append(f"- **Average Completeness**: {self.stats['avg_completeness']}%")
-            report_lines.append(f"- **Average Confidence**: {self.stats['avg_confidence']}%")
-            grade = self._calculate_grade(self.stats['avg_completeness'], self.stats['avg_confidence'])
-            report_lines.append(f"- **Overall Grade**: {grade}")
-            report_lines.append("")
-
-            # Field Coverage Table
-            report_lines.append("## Field Coverage")
-            report_lines.append("")
-            report_lines.append("| Field | Found | Coverage | Avg Confidence | Quality |")
-            report_lines.append("|-------|-------|----------|----------------|---------|")
-
-            for field_name, coverage_data in sorted(self.stats['field_coverage'].items()):
-                found = coverage_data['found']
-                total = coverage_data['total']
-                coverage_pct = int((found / total) * 100) if total > 0 else 0
-
-                avg_conf = self.stats['field_confidence'].get(field_name, 0)
-                field_grade = self._calculate_grade(coverage_pct, avg_conf)
-
-                report_lines.append(f"| {field_name} | {found}/{total} | {coverage_pct}% | {avg_conf}% | {field_grade} |")
-
-            report_lines.append("")
+            stats = self.stats
+            total_jobs = stats['total_jobs']
 
             # Quality Distribution
-            report_lines.append("## Quality Distribution")
-            report_lines.append("")
-            dist = self.stats['quality_distribution']
+            dist = stats['quality_distribution']
+            distribution_rows = []
             for grade in ["A", "B", "C", "D", "F"]:
                 count = dist[grade]
-                pct = int((count / self.stats['total_jobs']) * 100) if self.stats['total_jobs'] > 0 else 0
+                pct = int((count / total_jobs) * 100) if total_jobs > 0 else 0
                 bar = "█" * (pct // 5)  # Visual bar
-                report_lines.append(f"- **{grade} Grade**: {count} jobs ({pct}%) {bar}")
-
-            report_lines.append("")
+                distribution_rows.append(DISTRIBUTION_ROW_TEMPLATE.format(
+                    grade=grade, count=count, pct=pct, bar=bar))
 
             # Extraction Sources
-            report_lines.append("## Extraction Sources")
-            report_lines.append("")
-            sources = self.stats['extraction_sources']
+            sources = stats['extraction_sources']
             total_sources = sum(sources.values())
-
-            for source, count in sorted(sources.items(), key=lambda x: x[1], reverse=True):
-                if total_sources > 0:
-                    pct = int((count / total_sources) * 100)
-                    report_lines.append(f"- **{source.capitalize()}**: {count} ({pct}%)")
-
-            report_lines.append("")
+            source_rows = []
+            if total_sources > 0:
+                for source, count in sorted(sources.items(), key=lambda x: x[1], reverse=True):
+                    source_rows.append(SOURCE_ROW_TEMPLATE.format(
+                        source=source.capitalize(), count=count,
+                        pct=int((count / total_sources) * 100)))
 
             # Recommendations
-            report_lines.append("## Recommendations")
-            report_lines.append("")
-            recommendations = self._generate_recommendations()
-            for i, rec in enumerate(recommendations, 1):
-                report_lines.append(f"### {i}. {rec['title']}")
-                report_lines.append("")
-                report_lines.append(f"**Issue**: {rec['issue']}")
-                report_lines.append(f"**Impact**: {rec['impact']}")
-                report_lines.append(f"**Solution**: {rec['solution']}")
-                report_lines.append(f"**Expected Improvement**: {rec['improvement']}")
-                report_lines.append("")
+            recommendations = [
+                RECOMMENDATION_TEMPLATE.format_map({"index": i, **rec})
+                for i, rec in enumerate(self._generate_recommendations(), 1)
+            ]
+
+            report = REPORT_TEMPLATE.format_map({
+                "generated": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "session": self.session_dir.name,
+                "total_jobs": total_jobs,
+                "avg_completeness": stats['avg_completeness'],
+                "avg_confidence": stats['avg_confidence'],
+                "overall_grade": self._calculate_grade(stats['avg_completeness'],
+                                                       stats['avg_confidence']),
+                "field_rows": "".join(self._field_coverage_rows()),
+                "distribution_rows": "".join(distribution_rows),
+                "source_rows": "".join(source_rows),
+                "recommendations": "".join(recommendations),
+            })
 
             # Write report
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'w') as f:
-                f.write("\n".join(report_lines))
+            report_path = Path(output_path)
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_bytes(report.encode("utf-8"))
 
             return True
 
@@ -238,23 +346,33 @@ class ReportGenerator:
             print(f"❌ Error generating report: {e}")
             return False
 
+    def _field_coverage_rows(self) -> Iterator[str]:
+        """Yield the field coverage table rows, sorted by field name."""
+        field_coverage = self.stats['field_coverage']
+        field_confidence = self.stats['field_confidence']
+        calculate_grade = self._calculate_grade
+
+        for field_name in self.sorted_fields:
+            coverage_data = field_coverage[field_name]
+            found = coverage_data['found']
+            total = coverage_data['total']
+            coverage_pct = int((found / total) * 100) if total > 0 else 0
+            avg_conf = field_confidence.get(field_name, 0)
+
+            yield FIELD_ROW_TEMPLATE.format(
+                field=field_name, found=found, total=total, coverage=coverage_pct,
+                confidence=avg_conf, grade=calculate_grade(coverage_pct, avg_conf))
+
     def _calculate_grade(self, completeness: float, confidence: float) -> str:
         """Calculate quality grade from completeness and confidence."""
-        score = (completeness * 0.6) + (confidence * 0.4)
-
-        if score >= 90:
-            return "A"
-        elif score >= 75:
-            return "B"
-        elif score >= 60:
-            return "C"
-        elif score >= 50:
-            return "D"
-        else:
-            return "F"
+        return GRADES[_grade_index(completeness, confidence)]
 
     def _generate_recommendations(self) -> List[Dict]:
-        """Generate actionable recommendations based on statistics."""
+        """
+        Generate actionable recommendations based on statistics.
+
+        Stops as soon as MAX_RECOMMENDATIONS are collected, coverage issues first.
+        """
         recommendations = []
 
         # Find fields with low coverage
@@ -272,6 +390,8 @@ class ReportGenerator:
                     "solution": f"Add more patterns and aliases for {field_name} extraction",
                     "improvement": f"Expected +15-20% coverage"
                 })
+                if len(recommendations) == MAX_RECOMMENDATIONS:
+                    return recommendations
 
         # Find fields with low confidence
         for field_name, avg_conf in self.stats['field_confidence'].items():
@@ -283,65 +403,134 @@ class ReportGenerator:
                     "solution": f"Add structured data extraction for {field_name}, improve pattern matching",
                     "improvement": f"Expected +10-15% confidence"
                 })
+                if len(recommendations) == MAX_RECOMMENDATIONS:
+                    break
+
+        return recommendations
+
+
+def _generate_session_report(session_dir: str, output_path: str,
+                             tracked_fields: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Load one session and write its markdown report.
+
+    Args:
+        session_dir: Path to session directory
+        output_path: Path to save report
+        tracked_fields: Field names to report on, None for all
+
+    Returns:
+        Result dict as returned by the 'generate' action
+    """
+    generator = ReportGenerator(session_dir, tracked_fields)
+
+    if not generator.load_session_data():
+        return {
+            "success": False,
+            "error": "No jobs found in session"
+        }
+
+    stats = generator.calculate_statistics()
+
+    if not generator.generate_markdown_report(output_path):
+        return {
+            "success": False,
+            "error": "Failed to generate report"
+        }
+
+    return {
+        "success": True,
+        "report_path": output_path,
+        "stats": {
+            "total_jobs": stats["total_jobs"],
+            "avg_completeness": stats["avg_completeness"],
+            "avg_confidence": stats["avg_confidence"]
+        }
+    }
+
+
+def _generate_batch_report(session: Any, tracked_fields: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Generate the report for one 'batch_generate' entry in a worker process.
+
+    Args:
+        session: Session directory, or {"session_dir", "output_path"} dict;
+                 the report defaults to output/reports/<session>_quality_report.md
 
-        # Limit to top 5 recommendations
-        return recommendations[:5]
+    Returns:
+        Result dict tagged with its session_dir
+    """
+    if isinstance(session, str):
+        session = {"session_dir": session}
+
+    session_dir = session.get("session_dir")
+    if not session_dir:
+        return {
+            "success": False,
+            "error": "Missing required field: 'session_dir'"
+        }
+
+    output_path = session.get(
+        "output_path", f"output/reports/{Path(session_dir).name}_quality_report.md"
+    )
+    try:
+        result = _generate_session_report(session_dir, output_path, tracked_fields)
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+
+    return {"session_dir": session_dir, **result}
 
 
 # JSON I/O Interface for Agent Calls
 if __name__ == "__main__":
-    import json
     import sys
 
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = _loads(sys.stdin.buffer.read())
         action = input_data.get("action", "generate")
 
         session_dir = input_data.get("session_dir")
 
-        if not session_dir:
+        if not session_dir and action != "batch_generate":
             result = {
                 "success": False,
                 "error": "Missing required field: 'session_dir'"
             }
-            print(json.dumps(result))
+            print(_dumps(result))
             sys.exit(1)
 
-        generator = ReportGenerator(session_dir)
+        tracked_fields = input_data.get("tracked_fields")
 
         if action == "generate":
             # Generate full report
-            if generator.load_session_data():
-                stats = generator.calculate_statistics()
-
-                output_path = input_data.get("output_path", "output/reports/quality_report.md")
-
-                if generator.generate_markdown_report(output_path):
-                    result = {
-                        "success": True,
-                        "report_path": output_path,
-                        "stats": {
-                            "total_jobs": stats["total_jobs"],
-                            "avg_completeness": stats["avg_completeness"],
-                            "avg_confidence": stats["avg_confidence"]
-                        }
-                    }
-                else:
-                    result = {
-                        "success": False,
-                        "error": "Failed to generate report"
-                    }
-            else:
-                result = {
-                    "success": False,
-                    "error": "No jobs found in session"
-                }
+            output_path = input_data.get("output_path", "output/reports/quality_report.md")
+            result = _generate_session_report(session_dir, output_path, tracked_fields)
+
+        elif action == "batch_generate":
+            # Generate reports for many sessions, one worker process each
+            sessions = input_data.get("sessions", [])
+            reports = []
+            if sessions:
+                workers = min(os.cpu_count() or 1, len(sessions))
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    reports = list(executor.map(_generate_batch_report, sessions,
+                                                [tracked_fields] * len(sessions)))
+
+            result = {
+                "success": all(report["success"] for report in reports),
+                "reports": reports
+            }
 
         elif action == "get_stats":
-            # Just get statistics without generating report
+            # Just get statistics without generating report; per-field
+            # statistics can be skipped with "include_fields": false
+            generator = ReportGenerator(session_dir, tracked_fields)
             if generator.load_session_data():
-                stats = generator.calculate_statistics()
+                if input_data.get("include_fields", True):
+                    stats = generator.calculate_statistics()
+                else:
+                    stats = generator.calculate_core_stats()
 
                 result = {
                     "success": True,
@@ -356,7 +545,7 @@ if __name__ == "__main__":
         else:
             result = {"success": False, "error": f"Unknown action: {action}"}
 
-        print(json.dumps(result))
+        print(_dumps(result))
         sys.exit(0)
 
     except Exception as e:
@@ -364,5 +553,5 @@ if __name__ == "__main__":
             "success": False,
             "error": str(e)
         }
-        print(json.dumps(error_result))
+        print(_dumps(error_result))
         sys.exit(1)
@@ -6,9 +6,38 @@ Loads, validates, and processes extraction schemas for job scraping.
 """
 
 import json
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """Serialize to a compact JSON string."""
+    if orjson:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+@lru_cache(maxsize=8)
+def _load_schema(schema_path: str, mtime_ns: int) -> Dict:
+    """
+    Parse a schema file, memoized per modification time so an edited file is
+    re-read. Callers must not mutate the returned schema.
+    """
+    return _loads(Path(schema_path).read_bytes())
+
 
 class SchemaProcessor:
     """Process and validate extraction schemas."""
@@ -23,6 +52,8 @@ class SchemaProcessor:
         self.schema_path = schema_path
         self.schema: Optional[Dict] = None
         self.all_fields: Dict[str, Dict] = {}
+        self.field_aliases: Dict[str, List[str]] = {}
+        self.required_fields: List[str] = []
         self.validation_errors: List[str] = []
 
     def load(self) -> bool:
@@ -33,8 +64,8 @@ class SchemaProcessor:
             True if loaded successfully
         """
         try:
-            with open(self.schema_path, 'r') as f:
-                self.schema = json.load(f)
+            mtime_ns = Path(self.schema_path).stat().st_mtime_ns
+            self.schema = _load_schema(self.schema_path, mtime_ns)
 
             # Compile all fields
             self._compile_fields()
@@ -63,6 +94,13 @@ class SchemaProcessor:
             if priority in extraction_schema:
                 self.all_fields.update(extraction_schema[priority])
 
+        # Lookups answered from these rather than the nested schema
+        self.field_aliases = {
+            field_name: field_config.get("aliases", [field_name]) if field_config else [field_name]
+            for field_name, field_config in self.all_fields.items()
+        }
+        self.required_fields = list(extraction_schema.get("required", {}).keys())
+
     def _validate(self) -> bool:
         """
         Validate schema structure and configuration.
@@ -126,8 +164,7 @@ class SchemaProcessor:
 
     def get_required_fields(self) -> List[str]:
         """Get list of required field names."""
-        extraction_schema = self.schema.get("extraction_schema", {})
-        return list(extraction_schema.get("required", {}).keys())
+        return list(self.required_fields)
 
     def get_field_aliases(self, field_name: str) -> List[str]:
         """
@@ -139,10 +176,8 @@ class SchemaProcessor:
         Returns:
             List of aliases
         """
-        field_config = self.get_field_config(field_name)
-        if field_config:
-            return field_config.get("aliases", [field_name])
-        return [field_name]
+        # Copy: alias lists belong to the schema cache shared across processors
+        return list(self.field_aliases.get(field_name, [field_name]))
 
     def get_extraction_settings(self) -> Dict:
         """Get extraction settings from schema."""
@@ -197,12 +232,11 @@ class SchemaProcessor:
 
 # JSON I/O Interface for Agent Calls
 if __name__ == "__main__":
-    import json
     import sys
 
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = _loads(sys.stdin.buffer.read())
         action = input_data.get("action", "load")
 
         schema_path = input_data.get("schema_path", "config/extraction_schema.json")
@@ -263,7 +297,7 @@ if __name__ == "__main__":
         else:
             result = {"success": False, "error": f"Unknown action: {action}"}
 
-        print(json.dumps(result))
+        print(_dumps(result))
         sys.exit(0)
 
     except Exception as e:
@@ -271,5 +305,5 @@ if __name__ == "__main__":
             "success": False,
             "error": str(e)
         }
-        print(json.dumps(error_result))
+        print(_dumps(error_result))
         sys.exit(1)
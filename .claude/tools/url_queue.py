@@ -6,11 +6,35 @@ Manages URL queue for scraping with status tracking and deduplication.
 """
 
 import json
+import os
 import hashlib
+import heapq
 from typing import List, Dict, Optional
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+# Compact the queue once its mutation log grows past this multiple of the snapshot size
+LOG_COMPACT_RATIO = 4
+
+
+def _loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, optionally indented by two spaces."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
 
 class URLQueue:
     """Manage URLs for scraping with status tracking."""
@@ -23,6 +47,8 @@ class URLQueue:
             queue_file: Path to queue JSON file
         """
         self.queue_file = queue_file
+        self.log_file = queue_file + ".log"
+        self.log_buffer = []  # Mutation records not yet appended to log_file
         self.queue_data = {
             "session_id": None,
             "source_url": None,
@@ -35,25 +61,25 @@ class URLQueue:
                 "failed": 0
             }
         }
-        self.url_hashes = set()  # For deduplication
+        self.url_hashes = set()  # 64-bit URL hashes for deduplication
+        self.url_index = {}  # URL -> position in queue_data["urls"]
+        self.pending_indices = []  # Min-heap of pending URL positions, may hold stale entries
 
     def load(self) -> bool:
         """
-        Load queue from file.
+        Load queue from file, replaying any mutations logged since the last save.
 
         Returns:
             True if loaded successfully
         """
         try:
             if Path(self.queue_file).exists():
-                with open(self.queue_file, 'r') as f:
-                    self.queue_data = json.load(f)
-
-                # Build hash set for deduplication
-                for url_item in self.queue_data["urls"]:
-                    url_hash = self._hash_url(url_item["url"])
-                    self.url_hashes.add(url_hash)
+                with open(self.queue_file, 'rb') as f:
+                    self.queue_data = _loads(f.read())
 
+                self._build_indexes()
+                self._replay_log()
+                self.log_buffer = []
                 return True
             return False
 
@@ -63,7 +89,7 @@ class URLQueue:
 
     def save(self) -> bool:
         """
-        Save queue to file.
+        Save full queue snapshot to file and truncate the mutation log.
 
         Returns:
             True if saved successfully
@@ -71,8 +97,17 @@ class URLQueue:
         try:
             Path(self.queue_file).parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self.queue_file, 'w') as f:
-                json.dump(self.queue_data, f, indent=2)
+            temp_file = self.queue_file + ".tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(_dumps(self.queue_data, indent=True))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.queue_file)
+
+            # Snapshot now holds every logged mutation
+            if os.path.exists(self.log_file):
+                os.remove(self.log_file)
+            self.log_buffer = []
 
             return True
 
@@ -80,6 +115,91 @@ class URLQueue:
             print(f"❌ Error saving queue: {e}")
             return False
 
+    def flush_log(self) -> bool:
+        """
+        Append buffered mutations to the log file instead of rewriting the queue.
+
+        Falls back to a full save when the log outgrows the snapshot.
+
+        Returns:
+            True if flushed successfully
+        """
+        if not Path(self.queue_file).exists():
+            return self.save()
+
+        if not self.log_buffer:
+            return True  # Nothing changed since the last flush
+
+        try:
+            with open(self.log_file, 'ab') as f:
+                f.write(b"".join(_dumps(record) + b"\n" for record in self.log_buffer))
+            self.log_buffer = []
+
+            if os.path.getsize(self.log_file) > LOG_COMPACT_RATIO * os.path.getsize(self.queue_file):
+                return self.save()
+
+            return True
+
+        except OSError as e:
+            print(f"❌ Error writing queue log: {e}")
+            return False
+
+    def _replay_log(self) -> None:
+        """Apply mutations from the log file on top of the loaded snapshot."""
+        try:
+            log_mtime = os.stat(self.log_file).st_mtime_ns
+        except FileNotFoundError:
+            return
+
+        # Every log entry is appended after the snapshot it applies to; an older
+        # log was left behind by a queue that has since been rewritten
+        if log_mtime < os.stat(self.queue_file).st_mtime_ns:
+            os.remove(self.log_file)
+            return
+
+        with open(self.log_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = self._parse_log_record(line)
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    # Torn or malformed record; snapshot what replayed so the
+                    # queue stays loadable and later appends stay readable
+                    self.save()
+                    return
+
+                if record["op"] == "add":
+                    # Adds are skipped if a snapshot already holds them
+                    if self._hash_url(record["item"]["url"]) not in self.url_hashes:
+                        self._apply_add(record["item"])
+                else:
+                    self._apply_update(record["url"], record["status"],
+                                       record.get("metadata"), record["at"])
+
+    @staticmethod
+    def _parse_log_record(line: bytes) -> Dict:
+        """
+        Parse one log line and check it has the fields replay relies on.
+
+        Raises:
+            ValueError (including JSONDecodeError), KeyError or TypeError if malformed
+        """
+        record = _loads(line)
+        op = record["op"]
+
+        if op == "add":
+            item = record["item"]
+            if not isinstance(item, dict) or not isinstance(item["url"], str) or "status" not in item:
+                raise ValueError("malformed add record")
+        elif op == "update":
+            if not all(isinstance(record[key], str) for key in ("url", "status", "at")):
+                raise ValueError("malformed update record")
+            if not isinstance(record.get("metadata") or {}, dict):
+                raise ValueError("malformed update metadata")
+        else:
+            raise ValueError(f"unknown log op: {op}")
+
+        return record
+
     def initialize(self, session_id: str, source_url: str) -> None:
         """
         Initialize new queue.
@@ -101,7 +221,20 @@ class URLQueue:
                 "failed": 0
             }
         }
+        self._build_indexes()
+        self.log_buffer = []
+
+    def _build_indexes(self) -> None:
+        """Rebuild the dedup hash set, URL index and pending heap from queue_data."""
         self.url_hashes = set()
+        self.url_index = {}
+        self.pending_indices = []  # Ascending, so already a valid heap
+
+        for index, url_item in enumerate(self.queue_data["urls"]):
+            self.url_hashes.add(self._hash_url(url_item["url"]))
+            self.url_index.setdefault(url_item["url"], index)
+            if url_item["status"] == "pending":
+                self.pending_indices.append(index)
 
     def add_url(self, url: str, metadata: Optional[Dict] = None) -> bool:
         """
@@ -114,10 +247,8 @@ class URLQueue:
         Returns:
             True if added, False if duplicate
         """
-        url_hash = self._hash_url(url)
-
         # Check for duplicate
-        if url_hash in self.url_hashes:
+        if self._hash_url(url) in self.url_hashes:
             return False
 
         # Add to queue
@@ -130,13 +261,21 @@ class URLQueue:
         if metadata:
             url_item.update(metadata)
 
+        self._apply_add(url_item)
+        self.log_buffer.append({"op": "add", "item": dict(url_item)})
+
+        return True
+
+    def _apply_add(self, url_item: Dict) -> None:
+        """Append a new URL item and update indexes and stats."""
+        index = len(self.queue_data["urls"])
         self.queue_data["urls"].append(url_item)
-        self.url_hashes.add(url_hash)
+        self.url_hashes.add(self._hash_url(url_item["url"]))
+        self.url_index.setdefault(url_item["url"], index)
+        heapq.heappush(self.pending_indices, index)
         self.queue_data["total_urls"] = len(self.queue_data["urls"])
         self.queue_data["stats"]["pending"] += 1
 
-        return True
-
     def add_urls_batch(self, urls: List[str], metadata: Optional[Dict] = None) -> int:
         """
         Add multiple URLs in batch.
@@ -148,13 +287,36 @@ class URLQueue:
         Returns:
             Number of URLs added (excluding duplicates)
         """
-        added_count = 0
+        # One timestamp for the whole batch; duplicates within it are dropped too
+        timestamp = datetime.now().isoformat()
+        url_hashes = self.url_hashes
+        new_items = []
 
         for url in urls:
-            if self.add_url(url, metadata):
-                added_count += 1
+            url_hash = self._hash_url(url)
+            if url_hash in url_hashes:
+                continue
+            url_hashes.add(url_hash)
+
+            url_item = {"url": url, "status": "pending", "discovered_at": timestamp}
+            if metadata:
+                url_item.update(metadata)
+            new_items.append(url_item)
 
-        return added_count
+        url_items = self.queue_data["urls"]
+        start = len(url_items)
+        url_items.extend(new_items)
+
+        for index, url_item in enumerate(new_items, start):
+            self.url_index.setdefault(url_item["url"], index)
+        # New positions are larger than any in the heap, so appending keeps it valid
+        self.pending_indices.extend(range(start, len(url_items)))
+
+        self.queue_data["total_urls"] = len(url_items)
+        self.queue_data["stats"]["pending"] += len(new_items)
+        self.log_buffer.extend({"op": "add", "item": dict(url_item)} for url_item in new_items)
+
+        return len(new_items)
 
     def get_next_pending(self) -> Optional[Dict]:
         """
@@ -163,11 +325,14 @@ class URLQueue:
         Returns:
             URL item dict or None if no pending URLs
         """
-        for url_item in self.queue_data["urls"]:
-            if url_item["status"] == "pending":
-                return url_item
+        urls = self.queue_data["urls"]
+        pending_indices = self.pending_indices
 
-        return None
+        # Drop entries whose URL has left the pending state since it was queued
+        while pending_indices and urls[pending_indices[0]]["status"] != "pending":
+            heapq.heappop(pending_indices)
+
+        return urls[pending_indices[0]] if pending_indices else None
 
     def get_all_pending(self) -> List[Dict]:
         """
@@ -190,28 +355,49 @@ class URLQueue:
         Returns:
             True if updated
         """
-        for url_item in self.queue_data["urls"]:
-            if url_item["url"] == url:
-                # Update stats
-                old_status = url_item["status"]
-                if old_status in self.queue_data["stats"]:
-                    self.queue_data["stats"][old_status] -= 1
+        timestamp = datetime.now().isoformat()
+        if not self._apply_update(url, status, metadata, timestamp):
+            return False
+
+        record = {"op": "update", "url": url, "status": status, "at": timestamp}
+        if metadata:
+            record["metadata"] = metadata
+        self.log_buffer.append(record)
 
-                # Set new status
-                url_item["status"] = status
-                if status in self.queue_data["stats"]:
-                    self.queue_data["stats"][status] += 1
+        return True
 
-                # Add metadata
-                if metadata:
-                    url_item.update(metadata)
+    def _apply_update(self, url: str, status: str, metadata: Optional[Dict],
+                      timestamp: str) -> bool:
+        """Set a URL's status, metadata and timestamp and update stats."""
+        index = self.url_index.get(url)
+        if index is None:
+            return False
 
-                # Add timestamp
-                url_item[f"{status}_at"] = datetime.now().isoformat()
+        url_item = self.queue_data["urls"][index]
 
-                return True
+        # Update stats
+        old_status = url_item["status"]
+        if old_status in self.queue_data["stats"]:
+            self.queue_data["stats"][old_status] -= 1
+
+        # Set new status
+        url_item["status"] = status
+        if status in self.queue_data["stats"]:
+            self.queue_data["stats"][status] += 1
+
+        # Add metadata
+        if metadata:
+            url_item.update(metadata)
 
-        return False
+        # Add timestamp
+        url_item[f"{status}_at"] = timestamp
+
+        # Re-queue URLs moved back to pending at their list position, as a reload
+        # would; stale entries are skipped lazily
+        if url_item["status"] == "pending" and old_status != "pending":
+            heapq.heappush(self.pending_indices, index)
+
+        return True
 
     def mark_processing(self, url: str) -> bool:
         """Mark URL as processing."""
@@ -289,7 +475,7 @@ class URLQueue:
             "percent_complete": round(percent, 1)
         }
 
-    def _hash_url(self, url: str) -> str:
+    def _hash_url(self, url: str) -> int:
         """
         Generate hash for URL for deduplication.
 
@@ -297,21 +483,21 @@ class URLQueue:
             url: URL to hash
 
         Returns:
-            URL hash
+            64-bit URL hash
         """
         # Normalize URL (remove trailing slashes, lowercase)
         normalized = url.lower().rstrip('/')
-        return hashlib.md5(normalized.encode()).hexdigest()
+        digest = hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
 
 
 # JSON I/O Interface for Agent Calls
 if __name__ == "__main__":
-    import json
     import sys
 
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = _loads(sys.stdin.buffer.read())
         action = input_data.get("action")
 
         queue_file = input_data.get("queue_file", "output/url_queue.json")
@@ -337,13 +523,15 @@ if __name__ == "__main__":
             metadata = input_data.get("metadata")
 
             added = queue.add_urls_batch(urls, metadata)
-            queue.save()
+            saved = queue.flush_log()
 
             result = {
-                "success": True,
+                "success": saved,
                 "added_count": added,
                 "total_urls": queue.queue_data["total_urls"]
             }
+            if not saved:
+                result["error"] = "Failed to write queue"
 
         elif action == "get_next":
             # Get next pending URL
@@ -363,11 +551,18 @@ if __name__ == "__main__":
             metadata = input_data.get("metadata")
 
             updated = queue.update_status(url, status, metadata)
-            queue.save()
+            saved = queue.flush_log()
+
+            if not updated:
+                message = "URL not found"
+            elif not saved:
+                message = "Failed to write queue"
+            else:
+                message = "Status updated"
 
             result = {
-                "success": updated,
-                "message": "Status updated" if updated else "URL not found"
+                "success": updated and saved,
+                "message": message
             }
 
         elif action == "get_progress":
@@ -392,7 +587,7 @@ if __name__ == "__main__":
         else:
             result = {"success": False, "error": f"Unknown action: {action}"}
 
-        print(json.dumps(result))
+        print(_dumps(result).decode('utf-8'))
         sys.exit(0)
 
     except Exception as e:
@@ -400,5 +595,5 @@ if __name__ == "__main__":
             "success": False,
             "error": str(e)
         }
-        print(json.dumps(error_result))
+        print(_dumps(error_result).decode('utf-8'))
         sys.exit(1)
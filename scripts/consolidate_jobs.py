@@ -3,12 +3,37 @@
 Job Consolidator - Merges all session jobs into master database
 """
 
+import csv
 import json
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Set
 import re
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+def _loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj) -> bytes:
+    """Serialize to two-space indented UTF-8 JSON bytes"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Patterns stripped by normalize_string
+COMPANY_SUFFIX_PATTERN = re.compile(r'\b(gmbh|ag|ltd|inc|llc|corp|corporation)\b')
+DIVERSITY_MARKER_PATTERN = re.compile(r'\(m/w/d\)|\(w/m/d\)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
 def normalize_string(s) -> str:
     """Normalize string for comparison"""
     if not s:
@@ -19,11 +44,11 @@ def normalize_string(s) -> str:
     # Convert to string
     s = str(s).lower().strip()
     # Remove common business suffixes
-    s = re.sub(r'\b(gmbh|ag|ltd|inc|llc|corp|corporation)\b', '', s)
+    s = COMPANY_SUFFIX_PATTERN.sub('', s)
     # Remove diversity markers
-    s = re.sub(r'\(m/w/d\)|\(w/m/d\)', '', s)
+    s = DIVERSITY_MARKER_PATTERN.sub('', s)
     # Remove extra whitespace
-    s = re.sub(r'\s+', ' ', s).strip()
+    s = WHITESPACE_PATTERN.sub(' ', s).strip()
     return s
 
 def extract_job_data(job_obj: dict, session_name: str, structure_type: str) -> dict:
@@ -76,14 +101,14 @@ def extract_job_data(job_obj: dict, session_name: str, structure_type: str) -> d
     return {}
 
 def load_session_jobs(session_path: Path) -> tuple[List[dict], str]:
-    """Load jobs from a session directory"""
+    """Load jobs from a session directory; runs in a worker process"""
     session_name = session_path.name
 
     # Check for api_response_all.json
     api_file = session_path / "api_response_all.json"
     if api_file.exists():
-        with open(api_file, 'r', encoding='utf-8') as f:
-            jobs = json.load(f)
+        with open(api_file, 'rb') as f:
+            jobs = _loads(f.read())
             return [extract_job_data(job, session_name, "api_response") for job in jobs], "api_response"
 
     # Check for jobs directory
@@ -92,8 +117,8 @@ def load_session_jobs(session_path: Path) -> tuple[List[dict], str]:
         jobs = []
         for job_file in sorted(jobs_dir.glob("*.json")):
             try:
-                with open(job_file, 'r', encoding='utf-8') as f:
-                    job_obj = json.load(f)
+                with open(job_file, 'rb') as f:
+                    job_obj = _loads(f.read())
 
                     # Determine structure type
                     if "job" in job_obj:
@@ -113,39 +138,85 @@ def load_session_jobs(session_path: Path) -> tuple[List[dict], str]:
 
     return [], "unknown"
 
-def detect_duplicates(jobs: List[dict]) -> tuple[List[dict], List[dict]]:
-    """Detect and separate duplicates"""
+def map_bounded(executor, fn, items: List, limit: int) -> Iterator:
+    """Like executor.map, but with at most `limit` calls submitted ahead of the consumer"""
+    in_flight = deque()
+    for item in items:
+        if len(in_flight) >= limit:
+            yield in_flight.popleft().result()
+        in_flight.append(executor.submit(fn, item))
+    while in_flight:
+        yield in_flight.popleft().result()
+
+def iter_all_jobs(session_dirs: List[Path], session_stats: List[dict]) -> Iterator[dict]:
+    """Yield jobs from every session, appending per-session stats as each one finishes"""
+    session_dirs = sorted(session_dirs)
+    if not session_dirs:
+        return
+
+    # Sessions parse in parallel and come back in order, so output stays
+    # deterministic; only `workers` sessions are loaded ahead of the writer,
+    # which bounds memory to that many sessions' jobs
+    workers = min(os.cpu_count() or 1, len(session_dirs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for session_dir, (jobs, structure_type) in zip(
+                session_dirs, map_bounded(executor, load_session_jobs, session_dirs, workers)):
+            yield from jobs
+
+            stats = {
+                "session": session_dir.name,
+                "jobs_count": len(jobs),
+                "structure_type": structure_type
+            }
+            session_stats.append(stats)
+            print(f"✓ {session_dir.name}: {len(jobs)} jobs ({structure_type})")
+
+def detect_duplicates(jobs: Iterable[dict]) -> Iterator[tuple[str, dict]]:
+    """Classify jobs as they stream past, yielding ("unique" | "duplicate", job)"""
     seen_urls: Set[str] = set()
-    seen_fuzzy: Set[str] = set()
-    unique_jobs = []
-    duplicate_jobs = []
+    seen_fuzzy: Set[tuple] = set()
 
     for job in jobs:
         url = job.get("url", "")
 
         # Check exact URL match
         if url and url in seen_urls:
-            duplicate_jobs.append({**job, "duplicate_reason": "exact_url"})
+            yield "duplicate", {**job, "duplicate_reason": "exact_url"}
             continue
 
         # Check fuzzy match (company + title + location)
         company = normalize_string(job.get("company", ""))
         title = normalize_string(job.get("title", ""))
         location = normalize_string(job.get("location", ""))
-        fuzzy_key = f"{company}|{title}|{location}"
+        fuzzy_key = (company, title, location)
+        has_fuzzy_key = any(fuzzy_key)
 
-        if fuzzy_key in seen_fuzzy and fuzzy_key != "||":
-            duplicate_jobs.append({**job, "duplicate_reason": "fuzzy_match", "fuzzy_key": fuzzy_key})
+        if has_fuzzy_key and fuzzy_key in seen_fuzzy:
+            yield "duplicate", {**job, "duplicate_reason": "fuzzy_match", "fuzzy_key": "|".join(fuzzy_key)}
             continue
 
         # This is unique
-        unique_jobs.append(job)
         if url:
             seen_urls.add(url)
-        if fuzzy_key != "||":
+        if has_fuzzy_key:
             seen_fuzzy.add(fuzzy_key)
+        yield "unique", job
+
+class JsonArrayWriter:
+    """Write items one at a time as a two-space indented JSON array"""
+
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
 
-    return unique_jobs, duplicate_jobs
+    def write(self, item):
+        self.f.write(b",\n  " if self.count else b"[\n  ")
+        # Nest the item one level deeper; JSON strings never contain raw newlines
+        self.f.write(_dumps(item).replace(b"\n", b"\n  "))
+        self.count += 1
+
+    def close(self):
+        self.f.write(b"\n]" if self.count else b"[]")
 
 def main():
     output_dir = Path("output")
@@ -153,77 +224,81 @@ def main():
     database_dir.mkdir(exist_ok=True)
 
     # Find all session directories
-    session_dirs = [d for d in output_dir.iterdir()
-                   if d.is_dir() and "session" in d.name and d.name != "database"]
+    # scandir entries carry the file type, so no stat per entry
+    with os.scandir(output_dir) as entries:
+        session_dirs = [Path(entry.path) for entry in entries
+                        if entry.is_dir() and "session" in entry.name and entry.name != "database"]
 
     print(f"Found {len(session_dirs)} sessions")
     print()
 
-    all_jobs = []
-    session_stats = []
+    master_file = database_dir / "jobs_master.json"
+    duplicates_file = database_dir / "jobs_duplicates.json"
+    csv_file = database_dir / "jobs_unique.csv"
+    stats_file = database_dir / "consolidation_stats.json"
 
-    # Load jobs from each session
-    for session_dir in sorted(session_dirs):
-        jobs, structure_type = load_session_jobs(session_dir)
-        all_jobs.extend(jobs)
+    # Stream jobs straight from the session files into the outputs; the master
+    # and CSV go to temp files (the master is replaced, not rewritten, as
+    # backups may hardlink it)
+    temp_master_file = master_file.with_suffix(".json.tmp")
+    temp_csv_file = csv_file.with_suffix(".csv.tmp")
+    session_stats = []
 
-        stats = {
-            "session": session_dir.name,
-            "jobs_count": len(jobs),
-            "structure_type": structure_type
-        }
-        session_stats.append(stats)
-        print(f"✓ {session_dir.name}: {len(jobs)} jobs ({structure_type})")
+    with open(temp_master_file, 'wb') as master_f, \
+            open(duplicates_file, 'wb') as duplicates_f, \
+            open(temp_csv_file, 'w', encoding='utf-8', newline='') as csv_f:
+        unique_writer = JsonArrayWriter(master_f)
+        duplicate_writer = JsonArrayWriter(duplicates_f)
+        fieldnames = ['id', 'url', 'title', 'company', 'location', 'session']
+        csv_writer = csv.DictWriter(csv_f, fieldnames=fieldnames, extrasaction='ignore')
+        csv_writer.writeheader()
+
+        for kind, job in detect_duplicates(iter_all_jobs(session_dirs, session_stats)):
+            if kind == "unique":
+                unique_writer.write(job)
+                csv_writer.writerow(job)
+            else:
+                duplicate_writer.write(job)
+
+        unique_writer.close()
+        duplicate_writer.close()
+
+    unique_count = unique_writer.count
+    duplicate_count = duplicate_writer.count
+    total_count = unique_count + duplicate_count
 
     print()
-    print(f"Total jobs loaded: {len(all_jobs)}")
+    print(f"Total jobs loaded: {total_count}")
 
-    # Detect duplicates
-    unique_jobs, duplicate_jobs = detect_duplicates(all_jobs)
+    duplicate_rate = (duplicate_count / total_count * 100) if total_count else 0
 
-    duplicate_rate = (len(duplicate_jobs) / len(all_jobs) * 100) if all_jobs else 0
-
-    print(f"Unique jobs: {len(unique_jobs)}")
-    print(f"Duplicates: {len(duplicate_jobs)}")
+    print(f"Unique jobs: {unique_count}")
+    print(f"Duplicates: {duplicate_count}")
     print(f"Duplicate rate: {duplicate_rate:.1f}%")
     print()
 
     # Save outputs
-    master_file = database_dir / "jobs_master.json"
-    duplicates_file = database_dir / "jobs_duplicates.json"
-    csv_file = database_dir / "jobs_unique.csv"
-    stats_file = database_dir / "consolidation_stats.json"
-
-    # Save master database
-    with open(master_file, 'w', encoding='utf-8') as f:
-        json.dump(unique_jobs, f, indent=2, ensure_ascii=False)
+    os.replace(temp_master_file, master_file)
     print(f"✓ Saved: {master_file}")
-
-    # Save duplicates
-    with open(duplicates_file, 'w', encoding='utf-8') as f:
-        json.dump(duplicate_jobs, f, indent=2, ensure_ascii=False)
     print(f"✓ Saved: {duplicates_file}")
 
-    # Save CSV
-    if unique_jobs:
-        import csv
-        with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['id', 'url', 'title', 'company', 'location', 'session']
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(unique_jobs)
+    # CSV is only kept when there is at least one unique job
+    if unique_count:
+        os.replace(temp_csv_file, csv_file)
         print(f"✓ Saved: {csv_file}")
+    else:
+        os.remove(temp_csv_file)
 
     # Save stats
     stats = {
         "sessions": session_stats,
-        "total_jobs": len(all_jobs),
-        "unique_jobs": len(unique_jobs),
-        "duplicates": len(duplicate_jobs),
+        "total_jobs": total_count,
+        "unique_jobs": unique_count,
+        "duplicates": duplicate_count,
         "duplicate_rate": round(duplicate_rate, 2)
     }
-    with open(stats_file, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, indent=2)
+    with open(stats_file, 'wb') as f:
+        f.write(_dumps(stats))
     print(f"✓ Saved: {stats_file}")
 
 if __name__ == "__main__":
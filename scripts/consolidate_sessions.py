@@ -6,8 +6,16 @@ Merges all scraping sessions into a unified master database
 
 import os
 import json
+import shutil
+import tempfile
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json when orjson is not installed
+    orjson = None
 
 # Session paths
 SESSIONS = [
@@ -22,6 +30,18 @@ OUTPUT_DIR = "output/database"
 BACKUP_DIR = "output/database/backups"
 REPORTS_DIR = "output/reports"
 
+def _loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj):
+    """Serialize to two-space indented UTF-8 JSON bytes (non-str keys allowed)"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 def extract_session_metadata(session_path):
     """Extract metadata from session directory name"""
     session_name = os.path.basename(session_path)
@@ -52,14 +72,14 @@ def extract_session_metadata(session_path):
         "session_path": session_path
     }
 
-def load_job_from_file(file_path, session_metadata):
+def load_job_from_file(file_path, session_metadata, job_filename=None):
     """Load a single job file and normalize its structure"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            job_data = json.load(f)
+        with open(file_path, 'rb') as f:
+            job_data = _loads(f.read())
 
         # Extract job ID from filename or data
-        job_filename = os.path.basename(file_path)
+        job_filename = job_filename or os.path.basename(file_path)
         job_id = job_filename.replace('.json', '')
 
         # Normalize structure - handle different formats
@@ -82,8 +102,8 @@ def load_job_from_file(file_path, session_metadata):
             # Job data is at root level
             normalized_job.update(job_data)
 
-        # Preserve original structure in case we need it
-        normalized_job['_original_structure'] = job_data
+        # Point back to the original file instead of embedding a second copy
+        normalized_job['_source_path'] = file_path
 
         return normalized_job
 
@@ -91,6 +111,84 @@ def load_job_from_file(file_path, session_metadata):
         print(f"Error loading {file_path}: {e}")
         return None
 
+class JsonArrayWriter:
+    """Write items one at a time as a two-space indented JSON array nested at the given depth"""
+
+    def __init__(self, f, depth=0):
+        self.f = f
+        self.count = 0
+        self.pad = b"  " * (depth + 1)
+
+    def write(self, item):
+        self.f.write(b",\n" + self.pad if self.count else b"[\n" + self.pad)
+        # Re-indent the item to its depth; JSON strings never contain raw newlines
+        self.f.write(_dumps(item).replace(b"\n", b"\n" + self.pad))
+        self.count += 1
+
+    def close(self):
+        self.f.write(b"\n" + self.pad[:-2] + b"]" if self.count else b"[]")
+
+def load_session(session_path):
+    """Load every job file in a session; runs in a worker process
+
+    Returns None if the session is missing, otherwise (session_metadata, jobs)
+    where jobs is None if the session has no jobs directory.
+    """
+    if not os.path.exists(session_path):
+        return None
+
+    session_metadata = extract_session_metadata(session_path)
+    jobs_dir = os.path.join(session_path, "jobs")
+
+    if not os.path.exists(jobs_dir):
+        return session_metadata, None
+
+    # Load all job files
+    with os.scandir(jobs_dir) as entries:
+        job_entries = [entry for entry in entries if entry.name.endswith('.json')]
+
+    jobs = []
+    for job_entry in job_entries:
+        job = load_job_from_file(job_entry.path, session_metadata, job_entry.name)
+        if job:
+            jobs.append(job)
+
+    return session_metadata, jobs
+
+def map_bounded(executor, fn, items, limit):
+    """Like executor.map, but with at most `limit` calls submitted ahead of the consumer"""
+    in_flight = deque()
+    for item in items:
+        if len(in_flight) >= limit:
+            yield in_flight.popleft().result()
+        in_flight.append(executor.submit(fn, item))
+    while in_flight:
+        yield in_flight.popleft().result()
+
+def index_job(index, job):
+    """Add a job to the lookup index"""
+    master_id = job["master_id"]
+
+    # Index by session
+    index["indices"]["by_session"][job["session_source"]].append(master_id)
+
+    # Index by company
+    if "company" in job:
+        company_key = job["company"] if isinstance(job["company"], str) else job["company"].get("name", "unknown")
+        index["indices"]["by_company"][company_key.lower()].append(master_id)
+
+    # Index by location
+    if "location" in job:
+        if isinstance(job["location"], str):
+            index["indices"]["by_location"][job["location"].lower()].append(master_id)
+        elif isinstance(job["location"], dict):
+            city = job["location"].get("city", "")
+            if city:
+                index["indices"]["by_location"][city.lower()].append(master_id)
+
+    # Lookup mapping
+    index["lookups"]["original_id_to_master"][job["original_id"]] = master_id
+
 def consolidate_sessions():
     """Main consolidation function"""
 
@@ -99,56 +197,70 @@ def consolidate_sessions():
     print("=" * 80)
     print()
 
-    all_jobs = []
     session_stats = []
 
     master_id_counter = 1
 
-    # Process each session
-    for session_path in SESSIONS:
-        if not os.path.exists(session_path):
-            print(f"⚠ Session not found: {session_path}")
-            continue
+    # Create index for fast lookups, filled in as jobs stream past
+    index = {
+        "version": "1.0",
+        "created": datetime.utcnow().isoformat() + "Z",
+        "indices": {
+            "by_session": defaultdict(list),
+            "by_company": defaultdict(list),
+            "by_location": defaultdict(list)
+        },
+        "lookups": {
+            "original_id_to_master": {}
+        }
+    }
 
-        session_metadata = extract_session_metadata(session_path)
-        print(f"Processing: {session_metadata['session_id']}")
+    # Jobs are serialized as they load into a spool file and spliced into the
+    # master database once the session totals that precede them are known
+    jobs_spool = tempfile.TemporaryFile(dir=OUTPUT_DIR)
+    jobs_writer = JsonArrayWriter(jobs_spool, depth=1)
+
+    # Sessions load in parallel and come back in SESSIONS order, so master IDs
+    # are still assigned deterministically here; only `workers` sessions are
+    # loaded ahead of the writer, which bounds memory to that many sessions' jobs
+    workers = min(os.cpu_count() or 1, len(SESSIONS))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for session_path, loaded in zip(SESSIONS, map_bounded(executor, load_session, SESSIONS, workers)):
+            if loaded is None:
+                print(f"⚠ Session not found: {session_path}")
+                continue
+
+            session_metadata, jobs = loaded
+            print(f"Processing: {session_metadata['session_id']}")
+
+            if jobs is None:
+                print(f"  No jobs directory found")
+                session_stats.append({
+                    **session_metadata,
+                    "jobs_contributed": 0,
+                    "status": "no_jobs_directory"
+                })
+                continue
+
+            for job in jobs:
+                # Assign master ID
+                job["master_id"] = f"master_{master_id_counter:05d}"
+                master_id_counter += 1
+                jobs_writer.write(job)
+                index_job(index, job)
 
-        jobs_dir = os.path.join(session_path, "jobs")
+            print(f"  ✓ Loaded {len(jobs)} jobs")
 
-        if not os.path.exists(jobs_dir):
-            print(f"  No jobs directory found")
             session_stats.append({
                 **session_metadata,
-                "jobs_contributed": 0,
-                "status": "no_jobs_directory"
+                "jobs_contributed": len(jobs),
+                "status": "success"
             })
-            continue
-
-        # Load all job files
-        job_files = [f for f in os.listdir(jobs_dir) if f.endswith('.json')]
-        jobs_loaded = 0
+            print()
 
-        for job_file in job_files:
-            job_path = os.path.join(jobs_dir, job_file)
-            job = load_job_from_file(job_path, session_metadata)
+    jobs_writer.close()
 
-            if job:
-                # Assign master ID
-                job["master_id"] = f"master_{master_id_counter:05d}"
-                master_id_counter += 1
-                all_jobs.append(job)
-                jobs_loaded += 1
-
-        print(f"  ✓ Loaded {jobs_loaded} jobs")
-
-        session_stats.append({
-            **session_metadata,
-            "jobs_contributed": jobs_loaded,
-            "status": "success"
-        })
-        print()
-
-    # Create master database structure
+    # Create master database structure; "jobs" is appended from the spool
     master_db = {
         "version": "1.0",
         "consolidation_date": datetime.utcnow().isoformat() + "Z",
@@ -156,64 +268,37 @@ def consolidate_sessions():
         "sessions": session_stats,
         "totals": {
             "sessions_consolidated": len([s for s in session_stats if s['status'] == 'success']),
-            "total_jobs": len(all_jobs),
+            "total_jobs": jobs_writer.count,
             "date_range": {
                 "earliest": min([s['session_date'] for s in session_stats if s['session_date']]),
                 "latest": max([s['session_date'] for s in session_stats if s['session_date']])
             }
-        },
-        "jobs": all_jobs
+        }
     }
 
     # Save master database
     master_db_path = os.path.join(OUTPUT_DIR, "jobs_master.json")
-    with open(master_db_path, 'w', encoding='utf-8') as f:
-        json.dump(master_db, f, indent=2, ensure_ascii=False)
+    # Write to a fresh inode so earlier hardlinked backups are never truncated
+    temp_path = master_db_path + ".tmp"
+    with open(temp_path, 'wb') as f, jobs_spool:
+        # Drop the closing "\n}" so the jobs array becomes the last key
+        f.write(_dumps(master_db)[:-2])
+        f.write(b',\n  "jobs": ')
+        jobs_spool.seek(0)
+        shutil.copyfileobj(jobs_spool, f)
+        f.write(b"\n}")
+    os.replace(temp_path, master_db_path)
 
     file_size_mb = os.path.getsize(master_db_path) / (1024 * 1024)
 
     # Create backup
     backup_timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     backup_path = os.path.join(BACKUP_DIR, f"jobs_master_{backup_timestamp}.json")
-    with open(backup_path, 'w', encoding='utf-8') as f:
-        json.dump(master_db, f, indent=2, ensure_ascii=False)
-
-    # Create index for fast lookups
-    index = {
-        "version": "1.0",
-        "created": datetime.utcnow().isoformat() + "Z",
-        "indices": {
-            "by_session": defaultdict(list),
-            "by_company": defaultdict(list),
-            "by_location": defaultdict(list)
-        },
-        "lookups": {
-            "original_id_to_master": {}
-        }
-    }
-
-    for job in all_jobs:
-        master_id = job["master_id"]
-
-        # Index by session
-        index["indices"]["by_session"][job["session_source"]].append(master_id)
-
-        # Index by company
-        if "company" in job:
-            company_key = job["company"] if isinstance(job["company"], str) else job["company"].get("name", "unknown")
-            index["indices"]["by_company"][company_key.lower()].append(master_id)
-
-        # Index by location
-        if "location" in job:
-            if isinstance(job["location"], str):
-                index["indices"]["by_location"][job["location"].lower()].append(master_id)
-            elif isinstance(job["location"], dict):
-                city = job["location"].get("city", "")
-                if city:
-                    index["indices"]["by_location"][city.lower()].append(master_id)
-
-        # Lookup mapping
-        index["lookups"]["original_id_to_master"][job["original_id"]] = master_id
+    try:
+        os.link(master_db_path, backup_path)
+    except OSError:
+        # Filesystem without hardlink support
+        shutil.copyfile(master_db_path, backup_path)
 
     # Convert defaultdicts to regular dicts for JSON
     index["indices"]["by_session"] = dict(index["indices"]["by_session"])
@@ -221,8 +306,8 @@ def consolidate_sessions():
     index["indices"]["by_location"] = dict(index["indices"]["by_location"])
 
     index_path = os.path.join(OUTPUT_DIR, "jobs_index.json")
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2, ensure_ascii=False)
+    with open(index_path, 'wb') as f:
+        f.write(_dumps(index))
 
     # Print summary
     print("=" * 80)
@@ -236,7 +321,7 @@ def consolidate_sessions():
     print(f"Index Created: {index_path}")
     print()
 
-    # Return stats for next phase
+    # Return stats for next phase (jobs live only in the master database file)
     return master_db, index
 
 if __name__ == "__main__":
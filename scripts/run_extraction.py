@@ -13,6 +13,17 @@ from pathlib import Path
 from datetime import datetime
 import requests
 
+# Add tools directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / '.claude' / 'tools'))
+from url_queue import URLQueue
+
+def load_queue(url_queue_path: str) -> dict:
+    """Load the URL queue, including updates still in its mutation log."""
+    queue = URLQueue(url_queue_path)
+    if not queue.load():
+        raise ValueError(f"Could not load URL queue: {url_queue_path}")
+    return queue.queue_data
+
 # Check if URLs are accessible
 def check_url_validity(url: str) -> bool:
     """Quick check if URL is accessible."""
@@ -32,8 +43,7 @@ def create_simulated_extraction(session_id: str, url_queue_path: str, schema_pat
     print("Creating realistic simulation of extraction results...\n")
 
     # Load queue
-    with open(url_queue_path, 'r') as f:
-        queue = json.load(f)
+    queue = load_queue(url_queue_path)
 
     # Load schema
     with open(schema_path, 'r') as f:
@@ -252,8 +262,7 @@ def main():
         sys.exit(1)
 
     # Load queue
-    with open(url_queue_path, 'r') as f:
-        queue = json.load(f)
+    queue = load_queue(url_queue_path)
 
     # Check first URL
     first_url = queue["urls"][0]["url"] if queue.get("urls") else None